@@ -12,9 +12,12 @@ API_BASE_URL = os.getenv("API_BASE_URL")
 def fetch_debate_history():
     """API를 통해 토론 이력 가져오기"""
     try:
-        response = requests.get(f"{API_BASE_URL}/debates/")
+        # 요약 목록 API - 목록에 필요한 컬럼만 조회
+        response = requests.get(
+            f"{API_BASE_URL}/debates/summary", params={"limit": 100}
+        )
         if response.status_code == 200:
-            debates = response.json()
+            debates = response.json()["items"]
             # API 응답 형식에 맞게 데이터 변환 (id, topic, date, rounds)
             return [
                 (debate["id"], debate["topic"], debate["created_at"], debate["rounds"])
@@ -76,55 +79,19 @@ def delete_debate_by_id(debate_id):
 def delete_all_debates():
     """API를 통해 모든 토론 삭제"""
     try:
-        # 모든 토론 목록 조회
-        debates = fetch_debate_history()
-        if not debates:
-            return True
-
-        # 각 토론 항목 삭제
-        success = True
-        for debate_id, _, _, _ in debates:
-            response = requests.delete(f"{API_BASE_URL}/debates/{debate_id}")
-            if response.status_code != 200:
-                success = False
-
-        if success:
+        # 일괄 삭제 API - 한 번의 요청/트랜잭션으로 전체 삭제
+        response = requests.delete(
+            f"{API_BASE_URL}/debates/", params={"all": "true"}
+        )
+        if response.status_code == 200:
             st.success("모든 토론이 삭제되었습니다.")
-        return success
-    except Exception as e:
-        st.error(f"API 호출 오류: {str(e)}")
-        return False
-
-
-# API로 토론 저장
-def save_debate(topic, rounds, messages, docs=None):
-    """API를 통해 토론 결과를 데이터베이스에 저장"""
-    try:
-        # API 요청 데이터 준비
-        debate_data = {
-            "topic": topic,
-            "rounds": rounds,
-            "messages": (
-                json.dumps(messages) if not isinstance(messages, str) else messages
-            ),
-            "docs": (
-                json.dumps(docs)
-                if docs and not isinstance(docs, str)
-                else (docs or "{}")
-            ),
-        }
-
-        response = requests.post(f"{API_BASE_URL}/debates/", json=debate_data)
-
-        if response.status_code == 200 or response.status_code == 201:
-            st.success("토론이 성공적으로 저장되었습니다.")
-            return response.json().get("id")  # 저장된 토론 ID 반환
+            return True
         else:
-            st.error(f"토론 저장 실패: {response.status_code} - {response.text}")
-            return None
+            st.error(f"토론 삭제 실패: {response.status_code}")
+            return False
     except Exception as e:
         st.error(f"API 호출 오류: {str(e)}")
-        return None
+        return False
 
 
 # 토론 이력 UI 렌더링
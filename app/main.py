@@ -3,7 +3,6 @@ import os
 from dotenv import load_dotenv
 import requests
 import streamlit as st
-from components.history import save_debate
 from components.sidebar import render_sidebar
 from utils.state_manager import init_session_state, reset_session_state
 
@@ -14,12 +13,113 @@ class AgentType:
     JUDGE = "JUDGE_AGENT"
 
 
-def process_event_data(event_data):
+def get_avatar(role):
+    if role == AgentType.PRO:
+        return "🙆🏻‍♀️"
+    elif role == AgentType.CON:
+        return "🙅🏻‍♂"
+    elif role == AgentType.JUDGE:
+        return "👩🏻‍⚖️"
+    return None
 
-    # 이벤트 종료
+
+def process_token_event(data, stream_state):
+    role = data.get("role")
+    current_round = data.get("round")
+    turn = (role, current_round)
+
+    # 새로운 발언이 시작되면 말풍선과 placeholder 생성
+    if stream_state.get("turn") != turn:
+        if role == AgentType.PRO:
+            st.subheader(f"{current_round}/{st.session_state.max_rounds} 라운드")
+
+        with st.chat_message(role, avatar=get_avatar(role)):
+            stream_state["placeholder"] = st.empty()
+        stream_state["turn"] = turn
+        stream_state["text"] = ""
+
+    stream_state["text"] += data.get("delta", "")
+    stream_state["placeholder"].markdown(stream_state["text"] + "▌")
+
+
+def apply_delta(event_data, stream_state):
+    seq = event_data.get("seq")
+    if seq != stream_state.get("seq", 0) + 1:
+        st.warning(f"누락된 이벤트가 있습니다. (seq: {seq})")
+    stream_state["seq"] = seq
+
+    debate = stream_state.setdefault("debate", {"messages": [], "docs": {}})
+    delta = event_data.get("data", {})
+
+    debate["messages"].extend(delta.get("messages", []))
+    debate["docs"].update(delta.get("docs", {}))
+    debate["current_round"] = delta.get("current_round")
+    debate["max_rounds"] = delta.get("max_rounds")
+
+    return {
+        "role": delta.get("role"),
+        "response": delta.get("response"),
+        "topic": debate.get("topic"),
+        "messages": debate["messages"],
+        "current_round": debate["current_round"],
+        "max_rounds": debate["max_rounds"],
+        "docs": debate["docs"],
+    }
+
+
+def process_event_data(event_data, stream_state=None):
+
+    if stream_state is None:
+        stream_state = {}
+
+    # 이벤트 종료 - 완료된 토론은 서버에서 저장됨
     if event_data.get("type") == "end":
+        end_data = event_data.get("data", {})
+        if end_data.get("debate_id") is not None:
+            st.success("토론이 성공적으로 저장되었습니다.")
+        elif end_data.get("error"):
+            st.error(end_data["error"])
+        return True
+
+    # 대기열 순번 안내
+    if event_data.get("type") == "queue":
+        position = event_data.get("data", {}).get("position")
+        if "queue_placeholder" not in stream_state:
+            stream_state["queue_placeholder"] = st.empty()
+        stream_state["queue_placeholder"].info(
+            f"진행 중인 토론이 많아 대기 중입니다. (대기 순번: {position})"
+        )
+        return False
+
+    # 서버에서 토론 진행 중 오류 발생
+    if event_data.get("type") == "error":
+        st.error(event_data.get("data", {}).get("message", "토론 진행 중 오류 발생"))
         return True
 
+    # 재개 및 체크포인트 정리에 사용할 세션 ID
+    if event_data.get("type") == "session":
+        stream_state["session_id"] = event_data.get("data", {}).get("session_id")
+        return False
+
+    # 대기가 끝나면 안내 메시지 제거
+    if "queue_placeholder" in stream_state:
+        stream_state.pop("queue_placeholder").empty()
+
+    # LLM 토큰 스트리밍
+    if event_data.get("type") == "token":
+        process_token_event(event_data.get("data", {}), stream_state)
+        return False
+
+    # delta 프로토콜 - 초기 스냅샷 저장
+    if event_data.get("type") == "snapshot":
+        stream_state["debate"] = event_data.get("data", {})
+        stream_state["seq"] = event_data.get("seq", 0)
+        return False
+
+    # delta 프로토콜 - 스냅샷에 변경분을 적용해 전체 상태 복원
+    if event_data.get("type") == "delta":
+        event_data = {"type": "update", "data": apply_delta(event_data, stream_state)}
+
     # 새로운 메세지
     if event_data.get("type") == "update":
         # state 추출
@@ -27,26 +127,23 @@ def process_event_data(event_data):
 
         role = data.get("role")
         response = data["response"]
-        topic = data["topic"]
         messages = data["messages"]
         current_round = data["current_round"]
         max_rounds = data["max_rounds"]
         docs = data.get("docs", {})
 
-        if role == AgentType.PRO:
-            st.subheader(f"{current_round}/{max_rounds} 라운드")
-
         message = response
 
-        if role == AgentType.PRO:
-            avatar = "🙆🏻‍♀️"
-        elif role == AgentType.CON:
-            avatar = "🙅🏻‍♂"
-        elif role == AgentType.JUDGE:
-            avatar = "👩🏻‍⚖️"
+        # 토큰으로 이미 그려진 발언이면 최종 응답으로 교체만 함
+        if stream_state.get("turn") == (role, current_round):
+            stream_state["placeholder"].markdown(message)
+            stream_state.pop("turn")
+        else:
+            if role == AgentType.PRO:
+                st.subheader(f"{current_round}/{max_rounds} 라운드")
 
-        with st.chat_message(role, avatar=avatar):
-            st.markdown(message)
+            with st.chat_message(role, avatar=get_avatar(role)):
+                st.markdown(message)
 
         if role == AgentType.JUDGE:
             st.session_state.app_mode = "results"
@@ -54,14 +151,6 @@ def process_event_data(event_data):
             st.session_state.messages = messages
             st.session_state.docs = docs
 
-            # 완료된 토론 정보 저장
-            save_debate(
-                topic,
-                max_rounds,
-                messages,
-                docs,
-            )
-
             # 참고 자료 표시
             if st.session_state.docs:
                 render_source_materials()
@@ -75,6 +164,9 @@ def process_event_data(event_data):
 
 
 def process_streaming_response(response):
+    # 토큰 스트리밍 중인 발언 정보 (역할, 라운드, placeholder)
+    stream_state = {}
+
     for chunk in response.iter_lines():
         if not chunk:
             continue
@@ -93,7 +185,7 @@ def process_streaming_response(response):
             event_data = json.loads(data_str)
 
             # 이벤트 데이터 처리
-            is_complete = process_event_data(event_data)
+            is_complete = process_event_data(event_data, stream_state)
 
             if is_complete:
                 break
@@ -115,6 +207,7 @@ def start_debate():
             "topic": topic,
             "max_rounds": max_rounds,
             "enable_rag": enabled_rag,
+            "protocol": "delta",  # 변경분만 전송받음
         }
 
         # 포트 충돌 방지를 위해 환경변수 사용
@@ -132,6 +225,11 @@ def start_debate():
             # stream=True로 설정하여 스트리밍 응답 처리
             # iter_lines() 또는 Iter_content()로 청크단위로 Read
 
+            if response.status_code == 503:
+                retry_after = response.headers.get("Retry-After", "잠시")
+                st.warning(f"진행 중인 토론이 너무 많습니다. {retry_after}초 후 다시 시도해주세요.")
+                return
+
             if response.status_code != 200:
                 st.error(f"API 오류: {response.status_code} - {response.text}")
                 return
@@ -0,0 +1,139 @@
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from db.database import Base, create_sqlite_engine
+from db.migrations import upgrade_schema
+from db.repository import get_debate, list_debate_summaries, save_debate_records
+
+# 이력 DB 동시 읽기/쓰기 벤치마크: server 경로에서 python -m db.benchmark
+# 기본 설정 엔진(rollback journal, 기본 풀)과 튜닝된 엔진(WAL, pragma, 풀)을 비교
+
+
+def _sample_debate(i: int) -> Dict[str, Any]:
+    messages = [
+        {
+            "role": role,
+            "content": f"{i}번 토론 {round}라운드 발언 " * 40,
+            "current_round": round,
+        }
+        for round in range(1, 4)
+        for role in ("PRO_AGENT", "CON_AGENT")
+    ]
+    docs = {
+        role: [f"참고 문서 {j} " * 60 for j in range(i % 5, i % 5 + 3)]
+        for role in ("PRO_AGENT", "CON_AGENT", "JUDGE_AGENT")
+    }
+    return {"topic": f"벤치마크 주제 {i}", "rounds": 3, "messages": messages, "docs": docs}
+
+
+def _run(engine: Engine, writers: int, readers: int, seconds: float) -> Dict[str, Any]:
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    latencies: Dict[str, List[float]] = {"write": [], "read": []}
+    errors = {"write": 0, "read": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    counter = iter(range(10**9))
+
+    def record(kind: str, started: float, ok: bool) -> None:
+        with lock:
+            if ok:
+                latencies[kind].append(time.perf_counter() - started)
+            else:
+                errors[kind] += 1
+
+    def writer() -> None:
+        while time.perf_counter() < deadline:
+            debate = _sample_debate(next(counter))
+            started = time.perf_counter()
+            db = Session()
+            try:
+                save_debate_records(db, **debate)
+                record("write", started, True)
+            except Exception:
+                db.rollback()
+                record("write", started, False)
+            finally:
+                db.close()
+
+    def reader() -> None:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            db = Session()
+            try:
+                rows, _ = list_debate_summaries(db, 20)
+                if rows:
+                    get_debate(db, random.choice(rows).id)
+                record("read", started, True)
+            except Exception:
+                record("read", started, False)
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    result = {}
+    for kind, values in latencies.items():
+        values.sort()
+        result[kind] = {
+            "ops_per_sec": round(len(values) / seconds, 1),
+            "p50_ms": round(statistics.median(values) * 1000, 2) if values else None,
+            "p95_ms": (
+                round(values[int(len(values) * 0.95) - 1] * 1000, 2) if values else None
+            ),
+            "errors": errors[kind],
+        }
+    return result
+
+
+def _prepare(engine: Engine, seed_debates: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = Session()
+    try:
+        for i in range(seed_debates):
+            save_debate_records(db, **_sample_debate(i))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="이력 DB 동시 읽기/쓰기 벤치마크")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--seed-debates", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engines = {
+            # 이전 db.database 설정과 동일한 기본 엔진
+            "default": create_engine(
+                f"sqlite:///{os.path.join(directory, 'default.db')}",
+                connect_args={"check_same_thread": False},
+            ),
+            "tuned": create_sqlite_engine(
+                f"sqlite:///{os.path.join(directory, 'tuned.db')}"
+            ),
+        }
+        for name, engine in engines.items():
+            _prepare(engine, args.seed_debates)
+            result = _run(engine, args.writers, args.readers, args.seconds)
+            engine.dispose()
+            for kind, stats in result.items():
+                print(f"{name:>8} {kind:>5}: {stats}")
@@ -0,0 +1,45 @@
+import threading
+from typing import Tuple
+
+from utils.config import settings
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성 - 없으면 압축하지 않고 저장
+    zstandard = None
+
+# zstd 압축기/해제기는 스레드 간 공유할 수 없으므로 스레드별로 생성
+_local = threading.local()
+
+
+def _compressor():
+    if not hasattr(_local, "compressor"):
+        _local.compressor = zstandard.ZstdCompressor(level=settings.DB_COMPRESSION_LEVEL)
+    return _local.compressor
+
+
+def _decompressor():
+    if not hasattr(_local, "decompressor"):
+        _local.decompressor = zstandard.ZstdDecompressor()
+    return _local.decompressor
+
+
+def compress_text(text: str) -> Tuple[bytes, str]:
+    """텍스트를 저장용 바이트와 압축 방식(none | zstd)으로 변환합니다."""
+
+    data = text.encode("utf-8")
+    if (
+        settings.DB_COMPRESSION
+        and zstandard is not None
+        and len(data) >= settings.DB_COMPRESSION_MIN_BYTES
+    ):
+        return _compressor().compress(data), "zstd"
+    return data, "none"
+
+
+def decompress_text(data: bytes, compression: str) -> str:
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard package is required to read compressed data")
+        data = _decompressor().decompress(data)
+    return data.decode("utf-8")
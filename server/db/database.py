@@ -1,16 +1,57 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from utils.config import settings
 
-# SQLite 엔진 생성
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URI,
-    connect_args={"check_same_thread": False},  # SQLite 전용 설정
-)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    # WAL: 저장 중에도 이력 조회가 막히지 않음, NORMAL: WAL에서 안전한 범위로 fsync 감소
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    # 쓰기 잠금이 풀릴 때까지 대기 (즉시 database is locked 오류 방지)
+    cursor.execute(f"PRAGMA busy_timeout={settings.DB_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={settings.DB_MMAP_SIZE}")
+    # 토론 삭제 시 발언/문서 연결 행을 CASCADE로 삭제
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def create_sqlite_engine(url: str) -> Engine:
+    """연결마다 SQLite 설정을 적용하는 커넥션 풀 엔진을 생성합니다."""
+
+    engine = create_engine(
+        url,
+        connect_args={
+            "check_same_thread": False,  # SQLite 전용 설정
+            "timeout": settings.DB_BUSY_TIMEOUT_MS / 1000,
+        },
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+    )
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+# SQLite 엔진 생성 (토론 저장 등 스레드 풀에서 실행되는 동기 작업용)
+engine = create_sqlite_engine(settings.SQLALCHEMY_DATABASE_URI)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 비동기 엔진 (이력 API용) - 요청 처리 중 스레드 풀 워커를 점유하지 않음
+async_engine = create_async_engine(
+    settings.ASYNC_SQLALCHEMY_DATABASE_URI,
+    connect_args={"timeout": settings.DB_BUSY_TIMEOUT_MS / 1000},
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+)
+event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 # SQLAlchemy 모델 기본 클래스
 Base = declarative_base()
 
@@ -22,3 +63,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# 비동기 DB 세션 의존성
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,116 @@
+import os
+
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection, Engine
+
+from db.models import DebateDoc, DebateMessage, Document
+from db.search import LEGACY_TRIGGERS, backfill_search_index, create_search_index
+from db.storage import document_rows, message_rows, parse_debate_json
+
+# 저장 구조 마이그레이션 시 한 번에 변환할 토론 수
+MIGRATION_BATCH_SIZE = 500
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """create_all이 추가하지 못하는 기존 테이블의 컬럼/인덱스를 보완합니다."""
+
+    columns = {column["name"] for column in inspect(engine).get_columns("debates")}
+    with engine.begin() as conn:
+        # 토론 저장의 멱등성 키 (스트리밍 세션 ID)
+        if "session_id" not in columns:
+            conn.execute(text("ALTER TABLE debates ADD COLUMN session_id VARCHAR(36)"))
+        conn.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ix_debates_session_id "
+                "ON debates (session_id)"
+            )
+        )
+        # 목록 조회용 인덱스
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_debates_created_at_id "
+                "ON debates (created_at, id)"
+            )
+        )
+        conn.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_debates_topic ON debates (topic)")
+        )
+
+        # messages/docs JSON 컬럼을 정규화된 테이블로 이전
+        migrated = "messages" in columns
+        if migrated:
+            migrate_debate_storage(conn)
+
+        # 전문 검색 인덱스 - 처음 만들거나 저장 구조가 바뀌면 전체 색인
+        if create_search_index(conn) or migrated:
+            backfill_search_index(conn)
+
+
+def migrate_debate_storage(conn: Connection) -> int:
+    """debates.messages/docs JSON을 debate_messages, documents, debate_docs로 옮기고
+    기존 컬럼을 삭제합니다. 변환한 토론 수를 반환합니다.
+    """
+
+    migrated = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            text(
+                "SELECT id, messages, docs FROM debates "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": MIGRATION_BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+
+        messages, documents, links = [], {}, []
+        for debate_id, raw_messages, raw_docs in rows:
+            try:
+                parsed_messages, parsed_docs = parse_debate_json(
+                    raw_messages or "[]", raw_docs
+                )
+            except ValueError as e:
+                raise RuntimeError(f"Cannot migrate debate {debate_id}: {e}")
+            messages.extend(message_rows(debate_id, parsed_messages))
+            debate_documents, debate_links = document_rows(debate_id, parsed_docs)
+            documents.update((doc["hash"], doc) for doc in debate_documents)
+            links.extend(debate_links)
+
+        if messages:
+            conn.execute(DebateMessage.__table__.insert(), messages)
+        if documents:
+            conn.execute(
+                sqlite_insert(Document.__table__).on_conflict_do_nothing(),
+                list(documents.values()),
+            )
+        if links:
+            conn.execute(DebateDoc.__table__.insert(), links)
+
+        migrated += len(rows)
+        last_id = rows[-1][0]
+
+    # 이전 컬럼을 참조하는 트리거를 먼저 삭제해야 컬럼을 삭제할 수 있음
+    for trigger in LEGACY_TRIGGERS:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    conn.execute(text("ALTER TABLE debates DROP COLUMN messages"))
+    conn.execute(text("ALTER TABLE debates DROP COLUMN docs"))
+    return migrated
+
+
+# 기존 DB 변환: server 경로에서 python -m db.migrations
+# (서버 시작 시에도 자동으로 실행되며, 여기서는 변환 후 VACUUM으로 파일 크기를 줄임)
+if __name__ == "__main__":
+    from db.database import Base, engine
+    from utils.config import settings
+
+    size_before = (
+        os.path.getsize(settings.DB_PATH) if os.path.exists(settings.DB_PATH) else 0
+    )
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM"))
+    size_after = os.path.getsize(settings.DB_PATH)
+    print(f"DB 크기: {size_before:,} → {size_after:,} bytes")
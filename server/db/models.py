@@ -1,4 +1,14 @@
-from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import (
+    Column,
+    Integer,
+    DateTime,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    String,
+    Text,
+)
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from db.database import Base
@@ -11,6 +21,69 @@ class Debate(Base):
     id = Column(Integer, primary_key=True, index=True)
     topic = Column(String(255), nullable=False)
     rounds = Column(Integer, default=1)
-    messages = Column(Text, nullable=False)  # JSON 문자열로 저장
-    docs = Column(Text, nullable=True)  # JSON 문자열로 저장
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # 토론을 스트리밍한 세션 ID - 같은 세션의 중복 저장 방지
+    session_id = Column(String(36), unique=True, index=True, nullable=True)
+
+    # 발언과 참고 문서는 별도 테이블에 정규화하여 저장 (db.storage에서 JSON으로 조립)
+    message_rows = relationship(
+        "DebateMessage",
+        order_by="DebateMessage.position",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    doc_links = relationship(
+        "DebateDoc",
+        order_by="DebateDoc.position",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    __table_args__ = (
+        # 목록 조회의 키셋 페이지네이션 (created_at, id) 및 주제 접두어 검색용
+        Index("ix_debates_created_at_id", "created_at", "id"),
+        Index("ix_debates_topic", "topic"),
+    )
+
+
+# 토론 발언 (발언 순서대로 한 행씩)
+class DebateMessage(Base):
+    __tablename__ = "debate_messages"
+
+    id = Column(Integer, primary_key=True)
+    debate_id = Column(
+        Integer, ForeignKey("debates.id", ondelete="CASCADE"), nullable=False
+    )
+    position = Column(Integer, nullable=False)  # 토론 내 발언 순서
+    round = Column(Integer, nullable=True)
+    role = Column(String(32), nullable=False)
+    content = Column(Text, nullable=False)  # 전문 검색 인덱싱을 위해 압축하지 않음
+
+    __table_args__ = (
+        Index("ix_debate_messages_debate_id_position", "debate_id", "position"),
+    )
+
+
+# 참고 문서 본문 - 내용 해시로 주소를 지정해 여러 토론에서 한 번만 저장
+class Document(Base):
+    __tablename__ = "documents"
+
+    hash = Column(String(64), primary_key=True)  # 문서 JSON의 sha256
+    compression = Column(String(8), nullable=False, default="none")  # none | zstd
+    content = Column(LargeBinary, nullable=False)
+
+
+# 토론-문서 연결 (역할별 문서 순서 유지)
+class DebateDoc(Base):
+    __tablename__ = "debate_docs"
+
+    debate_id = Column(
+        Integer, ForeignKey("debates.id", ondelete="CASCADE"), primary_key=True
+    )
+    role = Column(String(32), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    doc_hash = Column(String(64), ForeignKey("documents.hash"), nullable=False)
+
+    document = relationship("Document", lazy="joined")
+
+    __table_args__ = (Index("ix_debate_docs_doc_hash", "doc_hash"),)
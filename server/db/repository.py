@@ -0,0 +1,305 @@
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import String, exists, insert, literal, tuple_, type_coerce
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+
+from db.models import Debate as DebateModel
+from db.models import DebateDoc, DebateMessage, Document
+from db.storage import assemble_debate, document_rows, message_rows, parse_debate_json
+
+
+def save_debate(
+    db: Session,
+    topic: str,
+    rounds: int,
+    messages: str,
+    docs: Optional[str] = None,
+    session_id: Optional[str] = None,
+) -> DebateModel:
+    """API 형식(messages/docs JSON 문자열)의 토론을 저장합니다."""
+
+    parsed_messages, parsed_docs = parse_debate_json(messages, docs)
+    return save_debate_records(
+        db, topic, rounds, parsed_messages, parsed_docs, session_id
+    )
+
+
+def save_debate_records(
+    db: Session,
+    topic: str,
+    rounds: int,
+    messages: List[Dict[str, Any]],
+    docs: Dict[str, List[Any]],
+    session_id: Optional[str] = None,
+) -> DebateModel:
+    """토론을 정규화하여 저장합니다. 같은 session_id로 이미 저장된 토론이 있으면 그대로 반환합니다."""
+
+    if session_id:
+        existing = (
+            db.query(DebateModel).filter(DebateModel.session_id == session_id).first()
+        )
+        if existing is not None:
+            return existing
+
+    db_debate = DebateModel(topic=topic, rounds=rounds, session_id=session_id)
+    db.add(db_debate)
+    try:
+        db.flush()  # 발언/문서 행에 사용할 id 할당
+        insert_debate_content(db, db_debate.id, messages, docs)
+        db.commit()
+    except IntegrityError:
+        # 같은 세션의 동시 저장 - 먼저 저장된 토론을 반환
+        db.rollback()
+        if not session_id:
+            raise
+        return db.query(DebateModel).filter(DebateModel.session_id == session_id).one()
+    db.refresh(db_debate)
+    return db_debate
+
+
+def insert_debate_content(
+    db: Session,
+    debate_id: int,
+    messages: List[Dict[str, Any]],
+    docs: Dict[str, List[Any]],
+) -> None:
+    """발언 행, 중복 제거된 문서, 토론-문서 연결을 한 번씩의 다중 행 INSERT로 저장합니다."""
+
+    documents, links = document_rows(debate_id, docs)
+    _insert_content_rows(db, message_rows(debate_id, messages), documents, links)
+
+
+def _insert_content_rows(
+    db: Session,
+    messages: List[Dict[str, Any]],
+    documents: List[Dict[str, Any]],
+    links: List[Dict[str, Any]],
+) -> None:
+    if messages:
+        db.execute(insert(DebateMessage), messages)
+    if documents:
+        # 이미 저장된 문서(같은 해시)는 건너뜀
+        db.execute(sqlite_insert(Document).on_conflict_do_nothing(), documents)
+    if links:
+        db.execute(insert(DebateDoc), links)
+
+
+def save_debates_bulk(db: Session, debates: List[Dict[str, Any]]) -> List[int]:
+    """여러 토론을 한 트랜잭션에서 테이블별 다중 행 INSERT로 저장하고, 입력 순서대로 id를 반환합니다.
+
+    이미 저장된 session_id(또는 배치 안에서 중복된 session_id)는 기존 토론의 id를 반환합니다.
+    """
+
+    parsed = [parse_debate_json(debate["messages"], debate.get("docs")) for debate in debates]
+
+    session_ids = {debate["session_id"] for debate in debates if debate.get("session_id")}
+    known: Dict[str, Optional[int]] = {}
+    if session_ids:
+        known.update(
+            db.query(DebateModel.session_id, DebateModel.id)
+            .filter(DebateModel.session_id.in_(session_ids))
+            .all()
+        )
+
+    # 새로 저장할 토론만 선별
+    new_indexes = []
+    for i, debate in enumerate(debates):
+        session_id = debate.get("session_id")
+        if session_id:
+            if session_id in known:
+                continue
+            known[session_id] = None  # 배치 안의 중복은 첫 번째 토론만 저장
+        new_indexes.append(i)
+
+    ids: List[Optional[int]] = [None] * len(debates)
+    if new_indexes:
+        new_ids = db.scalars(
+            insert(DebateModel).returning(DebateModel.id, sort_by_parameter_order=True),
+            [
+                {
+                    "topic": debates[i]["topic"],
+                    "rounds": debates[i]["rounds"],
+                    "session_id": debates[i].get("session_id"),
+                }
+                for i in new_indexes
+            ],
+        ).all()
+
+        messages, documents, links = [], {}, []
+        for i, debate_id in zip(new_indexes, new_ids):
+            ids[i] = debate_id
+            if debates[i].get("session_id"):
+                known[debates[i]["session_id"]] = debate_id
+            debate_messages, debate_docs = parsed[i]
+            messages.extend(message_rows(debate_id, debate_messages))
+            debate_documents, debate_links = document_rows(debate_id, debate_docs)
+            documents.update((doc["hash"], doc) for doc in debate_documents)
+            links.extend(debate_links)
+        _insert_content_rows(db, messages, list(documents.values()), links)
+
+    db.commit()
+    return [
+        debate_id if debate_id is not None else known[debates[i]["session_id"]]
+        for i, debate_id in enumerate(ids)
+    ]
+
+
+def delete_debates(
+    db: Session,
+    ids: Optional[List[int]] = None,
+    topic_prefix: Optional[str] = None,
+    before: Optional[datetime] = None,
+) -> int:
+    """조건에 맞는 토론을 한 번의 DELETE 문으로 삭제하고 삭제된 수를 반환합니다.
+
+    조건을 주지 않으면 모든 토론을 삭제합니다. 발언/문서 연결은 외래 키 CASCADE로 함께 삭제됩니다.
+    before는 해당 시각보다 먼저 생성된 토론만 삭제하며, 시간대가 없는 값은 UTC로 간주합니다.
+    """
+
+    query = db.query(DebateModel)
+    if ids is not None:
+        query = query.filter(DebateModel.id.in_(ids))
+    if topic_prefix:
+        query = query.filter(*_topic_prefix_filter(topic_prefix))
+    if before is not None:
+        # created_at은 CURRENT_TIMESTAMP(시간대 없는 UTC, 초 단위 문자열)로 저장되므로
+        # 같은 형식의 UTC 문자열로 변환해 비교 (시간대 누락/소수점 자리 차이로 인한 오삭제 방지)
+        if before.tzinfo is not None:
+            before = before.astimezone(timezone.utc).replace(tzinfo=None)
+        query = query.filter(
+            type_coerce(DebateModel.created_at, String)
+            < before.strftime("%Y-%m-%d %H:%M:%S")
+        )
+
+    deleted = query.delete(synchronize_session=False)
+    delete_orphan_documents(db)
+    db.commit()
+    return deleted
+
+
+def _with_content(query):
+    return query.options(
+        selectinload(DebateModel.message_rows),
+        selectinload(DebateModel.doc_links),
+    )
+
+
+def get_debate(db: Session, debate_id: int) -> Optional[Dict[str, Any]]:
+    debate = _with_content(db.query(DebateModel)).filter(DebateModel.id == debate_id)
+    debate = debate.first()
+    return assemble_debate(debate) if debate is not None else None
+
+
+def list_debates(db: Session, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    debates = _with_content(db.query(DebateModel)).offset(skip).limit(limit).all()
+    return [assemble_debate(debate) for debate in debates]
+
+
+def delete_debate(db: Session, debate_id: int) -> bool:
+    """토론 하나를 삭제합니다. 없으면 False를 반환합니다."""
+
+    db_debate = db.query(DebateModel).filter(DebateModel.id == debate_id).first()
+    if db_debate is None:
+        return False
+
+    # 발언/문서 연결은 외래 키 CASCADE로 함께 삭제
+    db.delete(db_debate)
+    db.flush()
+    delete_orphan_documents(db)
+    db.commit()
+    return True
+
+
+def delete_orphan_documents(db: Session) -> None:
+    """어떤 토론에서도 참조하지 않는 문서를 삭제합니다."""
+
+    db.query(Document).filter(
+        ~exists().where(DebateDoc.doc_hash == Document.hash)
+    ).delete(synchronize_session=False)
+
+
+def _topic_prefix_filter(topic_prefix: str):
+    # LIKE 대신 범위 조건을 사용해 topic 인덱스 활용
+    return (
+        DebateModel.topic >= topic_prefix,
+        DebateModel.topic < topic_prefix + "\U0010ffff",
+    )
+
+
+def _encode_cursor(created_at: str, debate_id: int) -> str:
+    raw = json.dumps([created_at, debate_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        created_at, debate_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(created_at), int(debate_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def list_debate_summaries(
+    db: Session,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    topic_prefix: Optional[str] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """최신순 토론 요약 목록과 다음 페이지 커서를 반환합니다.
+
+    messages/docs 컬럼은 읽지 않으며, (created_at, id) 키셋 페이지네이션으로
+    페이지 위치와 관계없이 인덱스 범위 탐색만 수행합니다.
+    """
+
+    # 커서 비교는 DB에 저장된 created_at 문자열 그대로 수행 (형식 변환 시 같은 시각 비교가 어긋남)
+    created_at_raw = type_coerce(DebateModel.created_at, String)
+    query = db.query(
+        DebateModel.id,
+        DebateModel.topic,
+        DebateModel.rounds,
+        DebateModel.created_at,
+        created_at_raw.label("created_at_raw"),
+    )
+
+    if topic_prefix:
+        query = query.filter(*_topic_prefix_filter(topic_prefix))
+
+    if cursor:
+        created_at, debate_id = _decode_cursor(cursor)
+        query = query.filter(
+            tuple_(created_at_raw, DebateModel.id)
+            < tuple_(literal(created_at, String), literal(debate_id))
+        )
+
+    # 다음 페이지 존재 여부 확인을 위해 한 건 더 조회
+    rows = (
+        query.order_by(DebateModel.created_at.desc(), DebateModel.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].created_at_raw, rows[-1].id)
+    return rows, next_cursor
+
+
+def save_debate_state(
+    db: Session, state: Dict[str, Any], session_id: str
+) -> DebateModel:
+    """그래프의 최종 상태(DebateState)를 토론 이력으로 저장합니다."""
+
+    return save_debate_records(
+        db,
+        topic=state["topic"],
+        rounds=state["max_rounds"],
+        messages=state["messages"],
+        docs=state.get("docs") or {},
+        session_id=session_id,
+    )
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -12,7 +12,8 @@ class DebateBase(BaseModel):
 
 
 class DebateCreate(DebateBase):
-    pass
+    # 저장 후 해당 토론의 그래프 체크포인트를 정리하기 위한 세션 ID
+    session_id: Optional[str] = None
 
 
 class DebateSchema(DebateBase):
@@ -21,3 +22,49 @@ class DebateSchema(DebateBase):
 
     class Config:
         from_attributes = True
+
+
+# 일괄 처리 요청/응답
+class DebateBatchCreate(BaseModel):
+    debates: List[DebateCreate] = Field(..., max_length=1000)
+
+
+class DebateBatchCreateResult(BaseModel):
+    ids: List[int]  # 요청 순서와 같은 순서의 토론 ID
+
+
+class DebateIdList(BaseModel):
+    # SQLite 바인드 변수 수 제한 안에서 한 번의 IN 조건으로 처리
+    ids: List[int] = Field(..., max_length=10000)
+
+
+class DebateDeleteResult(BaseModel):
+    deleted: int
+
+
+# 목록 조회용 요약 (messages/docs 제외)
+class DebateSummary(BaseModel):
+    id: int
+    topic: str
+    rounds: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class DebateSummaryPage(BaseModel):
+    items: List[DebateSummary]
+    next_cursor: Optional[str] = None  # 다음 페이지 요청에 전달할 커서
+
+
+# 전문 검색 결과 (일치 부분은 <mark>로 강조)
+class DebateSearchResult(DebateSummary):
+    topic_highlight: str
+    snippet: Optional[str] = None
+    score: float  # bm25 점수 (낮을수록 관련도 높음)
+
+
+class DebateSearchPage(BaseModel):
+    items: List[DebateSearchResult]
+    next_offset: Optional[int] = None
@@ -0,0 +1,142 @@
+import argparse
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import DateTime, Integer, String, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+# debates/debate_messages 테이블과 동기화되는 FTS5 인덱스 (rowid = debates.id)
+# 토론 행이 먼저 저장되고 발언은 순서대로 content 뒤에 이어 붙임
+SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS debates_fts USING fts5(
+        topic, content, tokenize = 'unicode61', prefix = '2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS debates_fts_insert AFTER INSERT ON debates BEGIN
+        INSERT INTO debates_fts (rowid, topic, content) VALUES (new.id, new.topic, '');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS debates_fts_delete AFTER DELETE ON debates BEGIN
+        DELETE FROM debates_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS debates_fts_update AFTER UPDATE OF topic ON debates
+    BEGIN
+        UPDATE debates_fts SET topic = new.topic WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS debate_messages_fts_insert
+    AFTER INSERT ON debate_messages BEGIN
+        UPDATE debates_fts
+        SET content = CASE WHEN content = '' THEN new.content
+                           ELSE content || char(10) || new.content END
+        WHERE rowid = new.debate_id;
+    END
+    """,
+]
+
+# 이전 버전(debates.messages JSON 기반)의 트리거 - 저장 구조 마이그레이션 시 삭제
+LEGACY_TRIGGERS = ["debates_fts_insert", "debates_fts_update"]
+
+# 주제 일치에 본문보다 높은 가중치 부여
+_SEARCH_SQL = """
+    SELECT d.id, d.topic, d.rounds, d.created_at,
+           highlight(debates_fts, 0, '<mark>', '</mark>') AS topic_highlight,
+           snippet(debates_fts, 1, '<mark>', '</mark>', '…', 24) AS snippet,
+           bm25(debates_fts, 10.0, 1.0) AS score
+    FROM debates_fts
+    JOIN debates AS d ON d.id = debates_fts.rowid
+    WHERE debates_fts MATCH :query
+    ORDER BY score
+    LIMIT :limit OFFSET :offset
+"""
+
+
+def create_search_index(conn: Connection) -> bool:
+    """FTS 테이블과 동기화 트리거를 만들고, 테이블을 새로 만들었으면 True를 반환합니다."""
+
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'debates_fts'")
+    ).first()
+    for ddl in SEARCH_INDEX_DDL:
+        conn.execute(text(ddl))
+    return exists is None
+
+
+def backfill_search_index(conn: Connection) -> int:
+    """기존 토론 전체로 FTS 인덱스를 다시 채우고 색인된 토론 수를 반환합니다."""
+
+    conn.execute(text("DELETE FROM debates_fts"))
+    conn.execute(
+        text(
+            """
+            INSERT INTO debates_fts (rowid, topic, content)
+            SELECT d.id, d.topic, coalesce((
+                SELECT group_concat(content, char(10)) FROM (
+                    SELECT content FROM debate_messages AS m
+                    WHERE m.debate_id = d.id ORDER BY m.position
+                )
+            ), '')
+            FROM debates AS d
+            """
+        )
+    )
+    # 세그먼트를 하나로 병합해 검색 속도 최적화
+    conn.execute(text("INSERT INTO debates_fts (debates_fts) VALUES ('optimize')"))
+    return conn.execute(text("SELECT count(*) FROM debates_fts")).scalar()
+
+
+def build_match_query(query: str) -> str:
+    """사용자 입력을 FTS5 MATCH 식으로 변환합니다.
+
+    각 단어를 따옴표로 감싸 FTS 문법으로 해석되지 않게 하고, 접두어 검색(*)으로
+    조사가 붙은 한국어 단어(예: '토론은')도 찾을 수 있게 합니다. 단어는 AND로 결합됩니다.
+    """
+
+    terms = ['"' + term.replace('"', '""') + '"*' for term in query.split()]
+    return " ".join(terms)
+
+
+def search_debates(
+    db: Session, query: str, limit: int = 20, offset: int = 0
+) -> Tuple[List[Any], Optional[int]]:
+    """관련도순 검색 결과와 다음 페이지 offset을 반환합니다."""
+
+    match_query = build_match_query(query)
+    if not match_query:
+        raise ValueError("Empty search query")
+
+    statement = text(_SEARCH_SQL).columns(
+        id=Integer,
+        topic=String,
+        rounds=Integer,
+        created_at=DateTime,
+        topic_highlight=String,
+        snippet=String,
+    )
+    # 다음 페이지 존재 여부 확인을 위해 한 건 더 조회
+    rows = db.execute(
+        statement, {"query": match_query, "limit": limit + 1, "offset": offset}
+    ).all()
+
+    next_offset = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_offset = offset + limit
+    return rows, next_offset
+
+
+# 기존 토론 색인: server 경로에서 python -m db.search
+if __name__ == "__main__":
+    from db.database import engine
+
+    argparse.ArgumentParser(description="토론 이력 전문 검색 인덱스 백필").parse_args()
+    with engine.begin() as conn:
+        create_search_index(conn)
+        indexed = backfill_search_index(conn)
+    print(f"{indexed}개의 토론을 색인했습니다.")
@@ -0,0 +1,107 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from db.compression import compress_text, decompress_text
+from db.models import Debate as DebateModel
+
+# 정규화된 토론 저장 구조와 API(DebateSchema)의 JSON 문자열 형태를 상호 변환하는 조립 계층
+
+
+def parse_debate_json(
+    messages: str, docs: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, List[Any]]]:
+    """API로 받은 messages/docs JSON 문자열을 파싱하고 형식을 검증합니다."""
+
+    try:
+        parsed_messages = json.loads(messages)
+        parsed_docs = json.loads(docs) if docs else {}
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e}")
+
+    if not isinstance(parsed_messages, list) or not all(
+        isinstance(message, dict) for message in parsed_messages
+    ):
+        raise ValueError("messages must be a JSON list of objects")
+    if not isinstance(parsed_docs, dict) or not all(
+        isinstance(role_docs, list) for role_docs in parsed_docs.values()
+    ):
+        raise ValueError("docs must be a JSON object of lists")
+    return parsed_messages, parsed_docs
+
+
+def message_rows(debate_id: int, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """발언 목록을 debate_messages 행으로 변환합니다."""
+
+    return [
+        {
+            "debate_id": debate_id,
+            "position": position,
+            "round": message.get("current_round"),
+            "role": message.get("role", ""),
+            "content": message.get("content", ""),
+        }
+        for position, message in enumerate(messages)
+    ]
+
+
+def document_rows(
+    debate_id: int, docs: Dict[str, List[Any]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """역할별 문서를 (documents 행, debate_docs 행)으로 변환합니다.
+
+    문서는 JSON 인코딩의 sha256으로 식별하므로 같은 문서는 한 번만 저장됩니다.
+    """
+
+    documents: Dict[str, Dict[str, Any]] = {}
+    links = []
+    for role, role_docs in docs.items():
+        for position, doc in enumerate(role_docs):
+            encoded = json.dumps(doc, ensure_ascii=False)
+            doc_hash = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+            if doc_hash not in documents:
+                content, compression = compress_text(encoded)
+                documents[doc_hash] = {
+                    "hash": doc_hash,
+                    "compression": compression,
+                    "content": content,
+                }
+            links.append(
+                {
+                    "debate_id": debate_id,
+                    "role": role,
+                    "position": position,
+                    "doc_hash": doc_hash,
+                }
+            )
+    return list(documents.values()), links
+
+
+def assemble_messages(debate: DebateModel) -> List[Dict[str, Any]]:
+    return [
+        {"role": row.role, "content": row.content, "current_round": row.round}
+        for row in debate.message_rows
+    ]
+
+
+def assemble_docs(debate: DebateModel) -> Dict[str, List[Any]]:
+    docs: Dict[str, List[Any]] = {}
+    for link in debate.doc_links:
+        document = link.document
+        docs.setdefault(link.role, []).append(
+            json.loads(decompress_text(document.content, document.compression))
+        )
+    return docs
+
+
+def assemble_debate(debate: DebateModel) -> Dict[str, Any]:
+    """정규화된 토론을 DebateSchema 형태(messages/docs JSON 문자열)로 조립합니다."""
+
+    return {
+        "id": debate.id,
+        "topic": debate.topic,
+        "rounds": debate.rounds,
+        "messages": json.dumps(assemble_messages(debate)),
+        "docs": json.dumps(assemble_docs(debate)),
+        "created_at": debate.created_at,
+    }
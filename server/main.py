@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 
@@ -5,22 +7,40 @@ from fastapi import FastAPI
 from routers import workflow
 
 # 데이터베이스 초기화를 위한 임포트 추가
-from db.database import Base, engine
-from routers import history
+from db.database import Base, async_engine, engine
+from db.migrations import upgrade_schema
+from routers import history, metrics
+from utils.config import http_clients
+from workflow.graph import get_debate_graph
 
 # 데이터베이스 초기화
 Base.metadata.create_all(bind=engine)
+upgrade_schema(engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 토론 그래프 템플릿을 미리 컴파일 (RAG 사용/미사용)
+    get_debate_graph(True)
+    get_debate_graph(False)
+    yield
+    # 종료 시 공유 HTTP/DB 커넥션 풀 정리
+    await http_clients.aclose()
+    await async_engine.dispose()
+
 
 # FastAPI 인스턴스 생성
 app = FastAPI(
     title="Debate Arena API",
     description="AI Debate Arena 서비스를 위한 API",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # router 추가
 app.include_router(history.router)
 app.include_router(workflow.router)
+app.include_router(metrics.router)
 
 # 실행은 server 경로에서
 # . venv/bin/activate
@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class RetrievalCache:
+    """(topic, role, language) 단위로 검색 결과(벡터 스토어)를 보관하는 TTL + LRU 캐시"""
+
+    def __init__(self, max_size: int = 128, ttl_seconds: float = 3600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 통계 카운터
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0  # 캐시 적중으로 절약한 빌드 시간 추정치
+        self._build_seconds: Dict[Hashable, float] = {}
+
+    @staticmethod
+    def make_key(topic: str, role: str, language: str) -> Tuple[str, str, str]:
+        # 공백/대소문자 차이로 캐시가 갈라지지 않도록 주제를 정규화
+        normalized_topic = " ".join(topic.split()).lower()
+        return (normalized_topic, role, language)
+
+    def get(self, key: Hashable, count_miss: bool = True) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if count_miss:
+                    self.misses += 1
+                return None
+
+            created_at, value = entry
+            if time.monotonic() - created_at > self.ttl_seconds:
+                # 만료된 항목 제거
+                del self._entries[key]
+                self._build_seconds.pop(key, None)
+                self.evictions += 1
+                if count_miss:
+                    self.misses += 1
+                return None
+
+            # LRU 순서 갱신
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += self._build_seconds.get(key, 0.0)
+            return value
+
+    def set(self, key: Hashable, value: Any, build_seconds: float = 0.0) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            self._build_seconds[key] = build_seconds
+
+            # 최대 크기를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+            while len(self._entries) > self.max_size:
+                old_key, _ = self._entries.popitem(last=False)
+                self._build_seconds.pop(old_key, None)
+                self.evictions += 1
+
+    def get_or_build(self, key: Hashable, builder: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        started = time.monotonic()
+        value = builder()
+        # 빌드 실패(None)는 캐시하지 않아 다음 턴에 다시 시도
+        if value is not None:
+            self.set(key, value, time.monotonic() - started)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._build_seconds.clear()
+            else:
+                self._entries.pop(key, None)
+                self._build_seconds.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "saved_seconds": round(self.saved_seconds, 3),
+            }
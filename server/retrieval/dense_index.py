@@ -0,0 +1,149 @@
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+
+MetadataFilter = Callable[[Dict[str, Any]], bool]
+
+
+class NumpyVectorStore:
+    """소규모 코퍼스용 NumPy 기반 벡터 스토어
+
+    토론 하나의 인덱스는 수십 개 문서에 불과하므로 FAISS 인덱스 대신
+    정규화된 float32 행렬 하나로 코사인 유사도 top-k와 MMR 재정렬을 수행합니다.
+    FAISS와 같은 similarity_search / max_marginal_relevance_search 인터페이스를 제공합니다.
+    """
+
+    def __init__(
+        self, embedding: Embeddings, documents: List[Document], vectors: np.ndarray
+    ):
+        self.embedding = embedding
+        self.documents = documents
+        self.vectors = vectors  # (문서 수, 차원) - 행 단위로 L2 정규화된 float32
+
+    @staticmethod
+    def _normalize(vectors: Any) -> np.ndarray:
+        matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    @classmethod
+    def from_documents(
+        cls, documents: List[Document], embedding: Embeddings
+    ) -> "NumpyVectorStore":
+        vectors = embedding.embed_documents([doc.page_content for doc in documents])
+        return cls(embedding, documents, cls._normalize(vectors))
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def _candidate_indices(self, filter: Optional[MetadataFilter]) -> np.ndarray:
+        if filter is None:
+            return np.arange(len(self.documents))
+        return np.array(
+            [i for i, doc in enumerate(self.documents) if filter(doc.metadata)],
+            dtype=np.int64,
+        )
+
+    def _top_k(
+        self, scores: np.ndarray, candidates: np.ndarray, k: int
+    ) -> np.ndarray:
+        # 후보 문서 중 점수가 높은 k개를 점수 내림차순으로 반환
+        k = min(k, len(candidates))
+        if k <= 0:
+            return np.array([], dtype=np.int64)
+        candidate_scores = scores[candidates]
+        top = np.argpartition(-candidate_scores, k - 1)[:k]
+        top = top[np.argsort(-candidate_scores[top])]
+        return candidates[top]
+
+    def similarity_search_with_score_by_vectors(
+        self,
+        query_vectors: Any,
+        k: int = 4,
+        filter: Optional[MetadataFilter] = None,
+    ) -> List[List[tuple]]:
+        """여러 쿼리 벡터에 대해 한 번의 행렬 곱으로 코사인 top-k를 계산합니다."""
+
+        queries = self._normalize(query_vectors)
+        candidates = self._candidate_indices(filter)
+        scores = queries @ self.vectors.T  # (쿼리 수, 문서 수)
+
+        results = []
+        for row in scores:
+            indices = self._top_k(row, candidates, k)
+            results.append([(self.documents[i], float(row[i])) for i in indices])
+        return results
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[MetadataFilter] = None,
+        **kwargs: Any,
+    ) -> List[tuple]:
+        query_vector = self.embedding.embed_query(query)
+        return self.similarity_search_with_score_by_vectors([query_vector], k, filter)[0]
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[MetadataFilter] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        return [
+            doc for doc, _ in self.similarity_search_with_score(query, k, filter)
+        ]
+
+    def batch_similarity_search(
+        self,
+        queries: List[str],
+        k: int = 4,
+        filter: Optional[MetadataFilter] = None,
+    ) -> List[List[Document]]:
+        query_vectors = self.embedding.embed_documents(queries)
+        return [
+            [doc for doc, _ in result]
+            for result in self.similarity_search_with_score_by_vectors(
+                query_vectors, k, filter
+            )
+        ]
+
+    def max_marginal_relevance_search(
+        self,
+        query: str,
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        filter: Optional[MetadataFilter] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        """관련성과 다양성을 함께 고려해 거의 같은 문서가 여러 자리를 차지하지 않도록 선택합니다."""
+
+        query_vector = self._normalize(self.embedding.embed_query(query))[0]
+        candidates = self._candidate_indices(filter)
+        scores = self.vectors @ query_vector
+        pool = self._top_k(scores, candidates, fetch_k)
+        if len(pool) == 0:
+            return []
+
+        pool_vectors = self.vectors[pool]
+        relevance = scores[pool]
+        # 후보 간 유사도 행렬 (한 번만 계산)
+        redundancy = pool_vectors @ pool_vectors.T
+
+        selected = [int(np.argmax(relevance))]
+        max_similarity = redundancy[selected[0]].copy()
+        while len(selected) < min(k, len(pool)):
+            mmr = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+            mmr[selected] = -np.inf
+            best = int(np.argmax(mmr))
+            selected.append(best)
+            max_similarity = np.maximum(max_similarity, redundancy[best])
+
+        return [self.documents[pool[i]] for i in selected]
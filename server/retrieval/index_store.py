@@ -0,0 +1,230 @@
+import hashlib
+import os
+import pickle
+import shutil
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import faiss
+import numpy as np
+from langchain_community.vectorstores import FAISS
+
+from retrieval.dense_index import NumpyVectorStore
+
+INDEX_FILE = "index.faiss"
+DOCSTORE_FILE = "docstore.pkl"
+VECTORS_FILE = "vectors.npy"  # NumpyVectorStore용 행렬
+
+
+class VectorIndexStore:
+    """주제별 벡터 인덱스(FAISS / NumPy)를 디스크에 저장하고 SQLite 매니페스트로 관리하는 저장소
+
+    서버 재시작이나 다른 uvicorn 워커에서도 같은 인덱스를 재사용할 수 있습니다.
+    """
+
+    def __init__(self, directory: str, max_age_seconds: float, max_bytes: int):
+        self.directory = directory
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self._manifest_path = os.path.join(directory, "manifest.db")
+
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS index_manifest (
+                    key TEXT PRIMARY KEY,
+                    topic_hash TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # 여러 워커 프로세스가 동시에 매니페스트에 접근하므로 WAL 모드 사용
+        conn = sqlite3.connect(self._manifest_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def topic_hash(topic: str) -> str:
+        normalized_topic = " ".join(topic.split()).lower()
+        return hashlib.sha256(normalized_topic.encode("utf-8")).hexdigest()
+
+    def _key(self, topic: str, role: str, language: str) -> str:
+        return f"{self.topic_hash(topic)}_{role}_{language}"
+
+    def load(
+        self, topic: str, role: str, language: str, embeddings: Any
+    ) -> Optional[Any]:
+        key = self._key(topic, role, language)
+        row = self._current(key)
+
+        # 읽는 도중 다른 워커가 새 버전을 게시한 경우를 위해 한 번 더 시도
+        for _ in range(2):
+            if row is None:
+                return None
+
+            path, created_at = row
+            # 검색 기간(최근 1년)보다 오래된 인덱스는 무효화
+            if time.time() - created_at > self.max_age_seconds:
+                self._remove(key, path)
+                return None
+
+            try:
+                vector_store = self._read(path, embeddings)
+            except Exception:
+                # 매니페스트가 다른 버전을 가리키면 교체 중에 읽은 것이므로 새 버전을 읽음
+                row = self._current(key)
+                if row is not None and row[0] != path:
+                    continue
+                # 현재 버전을 읽지 못하면 손상된 것으로 보고 제거 후 다시 생성
+                self._remove(key, path)
+                return None
+
+            with self._connect() as conn:
+                conn.execute(
+                    "UPDATE index_manifest SET last_accessed = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+            return vector_store
+
+        return None
+
+    def _current(self, key: str) -> Optional[Tuple[str, float]]:
+        """매니페스트에 게시된 현재 버전의 (경로, 생성 시각)"""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT path, created_at FROM index_manifest WHERE key = ?", (key,)
+            ).fetchone()
+
+    def _read(self, path: str, embeddings: Any) -> Any:
+        with open(os.path.join(path, DOCSTORE_FILE), "rb") as f:
+            docstore = pickle.load(f)
+
+        # NumPy 벡터 파일은 메모리 매핑으로 읽어 워커 간 페이지 캐시를 공유
+        vectors_path = os.path.join(path, VECTORS_FILE)
+        if os.path.exists(vectors_path):
+            vectors = np.load(vectors_path, mmap_mode="r")
+            return NumpyVectorStore(embeddings, docstore, vectors)
+
+        # FAISS flat 인덱스는 메모리 매핑을 지원하지 않으므로 전체를 메모리로 읽음
+        index = faiss.read_index(os.path.join(path, INDEX_FILE))
+        docstore, index_to_docstore_id = docstore
+        return FAISS(
+            embedding_function=embeddings,
+            index=index,
+            docstore=docstore,
+            index_to_docstore_id=index_to_docstore_id,
+        )
+
+    def _write(self, path: str, vector_store: Any) -> None:
+        if isinstance(vector_store, NumpyVectorStore):
+            np.save(os.path.join(path, VECTORS_FILE), vector_store.vectors)
+            docstore = vector_store.documents
+        else:
+            faiss.write_index(vector_store.index, os.path.join(path, INDEX_FILE))
+            docstore = (vector_store.docstore, vector_store.index_to_docstore_id)
+
+        with open(os.path.join(path, DOCSTORE_FILE), "wb") as f:
+            pickle.dump(docstore, f)
+
+    def save(self, topic: str, role: str, language: str, vector_store: Any) -> None:
+        key = self._key(topic, role, language)
+
+        # 버전마다 새 디렉터리에 쓰고 매니페스트가 가리키는 경로를 바꿔 게시
+        # (다른 워커가 읽는 중인 디렉터리를 덮어쓰거나 먼저 지우지 않음)
+        path = tempfile.mkdtemp(dir=self.directory, prefix=f"{key}.")
+        try:
+            self._write(path, vector_store)
+            size_bytes = sum(
+                os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)
+            )
+
+            now = time.time()
+            with self._connect() as conn:
+                # 이전 경로 조회와 교체를 한 트랜잭션으로 처리 (동시 저장 시 경로 유실 방지)
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT path FROM index_manifest WHERE key = ?", (key,)
+                ).fetchone()
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO index_manifest
+                        (key, topic_hash, role, language, path, size_bytes, created_at, last_accessed)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (key, self.topic_hash(topic), role, language, path, size_bytes, now, now),
+                )
+        except BaseException:
+            shutil.rmtree(path, ignore_errors=True)
+            raise
+
+        # 이전 버전은 게시 이후에 정리 (읽던 워커는 새 버전을 다시 읽음)
+        if row is not None and row[0] != path:
+            shutil.rmtree(row[0], ignore_errors=True)
+
+        self.evict()
+
+    def _remove(self, key: str, path: str) -> None:
+        # 그 사이 새 버전이 게시되었으면 매니페스트는 그대로 두고 해당 경로만 정리
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM index_manifest WHERE key = ? AND path = ?", (key, path)
+            )
+        shutil.rmtree(path, ignore_errors=True)
+
+    def evict(self) -> int:
+        """기간이 지난 인덱스를 지우고, 용량 예산을 넘으면 오래 사용되지 않은 순으로 제거"""
+        removed = 0
+        cutoff = time.time() - self.max_age_seconds
+
+        with self._connect() as conn:
+            stale = conn.execute(
+                "SELECT key, path FROM index_manifest WHERE created_at < ?", (cutoff,)
+            ).fetchall()
+            rows = conn.execute(
+                """
+                SELECT key, path, size_bytes FROM index_manifest
+                WHERE created_at >= ? ORDER BY last_accessed DESC
+                """,
+                (cutoff,),
+            ).fetchall()
+
+        for key, path in stale:
+            self._remove(key, path)
+            removed += 1
+
+        total_bytes = 0
+        for key, path, size_bytes in rows:
+            total_bytes += size_bytes
+            if total_bytes > self.max_bytes:
+                self._remove(key, path)
+                removed += 1
+
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            count, total_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM index_manifest"
+            ).fetchone()
+        return {
+            "indexes": count,
+            "size_bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "max_age_seconds": self.max_age_seconds,
+        }
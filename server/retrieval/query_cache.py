@@ -0,0 +1,166 @@
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+class SearchQueryCache:
+    """improve_search_query 결과(검색어 목록)를 위한 2단계 캐시
+
+    1단계는 정규화된 주제의 정확 일치, 2단계는 주제 임베딩의 코사인 유사도가
+    임계값 이상인 기존 주제를 찾는 의미 기반 일치입니다. 모두 SQLite에 TTL과 함께 저장됩니다.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float, similarity_threshold: float):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.Lock()
+
+        # 통계 카운터
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS search_query_cache (
+                    role TEXT NOT NULL,
+                    topic TEXT NOT NULL,
+                    queries TEXT NOT NULL,
+                    embedding BLOB,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (role, topic)
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def normalize(topic: str) -> str:
+        return " ".join(topic.split()).lower()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get_exact(self, topic: str, role: str) -> Optional[List[str]]:
+        cutoff = time.time() - self.ttl_seconds
+        with self._connect() as conn:
+            row = conn.execute(
+                """
+                SELECT queries FROM search_query_cache
+                WHERE role = ? AND topic = ? AND created_at >= ?
+                """,
+                (role, self.normalize(topic), cutoff),
+            ).fetchone()
+        if row is None:
+            return None
+        self._count("exact_hits")
+        return json.loads(row[0])
+
+    def get_similar(self, role: str, embedding: List[float]) -> Optional[List[str]]:
+        cutoff = time.time() - self.ttl_seconds
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT queries, embedding FROM search_query_cache
+                WHERE role = ? AND created_at >= ? AND embedding IS NOT NULL
+                """,
+                (role, cutoff),
+            ).fetchall()
+        if not rows:
+            return None
+
+        query = np.asarray(embedding, dtype=np.float32)
+        matrix = np.stack([np.frombuffer(blob, dtype=np.float32) for _, blob in rows])
+        norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+        norms[norms == 0] = 1.0
+        similarities = (matrix @ query) / norms
+
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+        self._count("semantic_hits")
+        return json.loads(rows[best][0])
+
+    def lookup(
+        self, topic: str, role: str, embed: Optional[Any] = None
+    ) -> Tuple[Optional[List[str]], Optional[List[float]]]:
+        """정확 일치 → 의미 기반 일치 순으로 조회하고 (검색어, 주제 임베딩)을 반환합니다."""
+
+        queries = self.get_exact(topic, role)
+        if queries is not None:
+            return queries, None
+
+        embedding = None
+        if embed is not None:
+            try:
+                embedding = embed(topic)
+                queries = self.get_similar(role, embedding)
+            except Exception:
+                # 임베딩 실패 시 의미 기반 캐시는 건너뜀
+                queries = None
+            if queries is not None:
+                return queries, embedding
+
+        self._count("misses")
+        return None, embedding
+
+    def set(
+        self,
+        topic: str,
+        role: str,
+        queries: List[str],
+        embedding: Optional[List[float]] = None,
+    ) -> None:
+        blob = (
+            np.asarray(embedding, dtype=np.float32).tobytes()
+            if embedding is not None
+            else None
+        )
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO search_query_cache
+                    (role, topic, queries, embedding, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    role,
+                    self.normalize(topic),
+                    json.dumps(queries, ensure_ascii=False),
+                    blob,
+                    time.time(),
+                ),
+            )
+            # 만료된 항목 정리
+            conn.execute(
+                "DELETE FROM search_query_cache WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.exact_hits + self.semantic_hits + self.misses
+            hits = self.exact_hits + self.semantic_hits
+            return {
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / total, 4) if total else 0.0,
+            }
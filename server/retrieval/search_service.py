@@ -1,9 +1,37 @@
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor, wait
 from langchain.schema import Document
-from typing import List, Literal
+from typing import Any, Dict, List, Literal
 from duckduckgo_search import DDGS
 from langchain.schema import HumanMessage, SystemMessage
-from utils.config import get_llm
+from retrieval.query_cache import SearchQueryCache
+from utils.config import call_llm, get_embeddings, get_llm, settings
+
+# 검색어별 웹 검색을 동시에 실행하는 스레드 풀
+_search_executor = ThreadPoolExecutor(
+    max_workers=settings.SEARCH_MAX_WORKERS, thread_name_prefix="web-search"
+)
+
+# 개선된 검색어 캐시 (정확 일치 + 의미 기반 일치)
+query_cache = SearchQueryCache(
+    db_path=settings.QUERY_CACHE_PATH,
+    ttl_seconds=settings.QUERY_CACHE_TTL,
+    similarity_threshold=settings.QUERY_CACHE_SIMILARITY,
+)
+
+# LLM을 사용하지 않을 때 쓰는 역할별 검색어 템플릿
+QUERY_TEMPLATES = {
+    "PRO_AGENT": ["{topic} 장점", "{topic} 찬성 근거", "{topic} 긍정적 효과"],
+    "CON_AGENT": ["{topic} 단점", "{topic} 반대 근거", "{topic} 부작용"],
+    "JUDGE_AGENT": ["{topic} 현황", "{topic} 통계", "{topic} 전문가 분석"],
+}
+
+
+def template_search_queries(
+    topic: str,
+    role: Literal["PRO_AGENT", "CON_AGENT", "JUDGE_AGENT"] = "JUDGE_AGENT",
+) -> List[str]:
+    return [template.format(topic=topic) for template in QUERY_TEMPLATES[role]]
 
 
 def improve_search_query(
@@ -11,6 +39,20 @@ def improve_search_query(
     role: Literal["PRO_AGENT", "CON_AGENT", "JUDGE_AGENT"] = "JUDGE_AGENT",
 ) -> List[str]:
 
+    # 응답 속도가 우선이면 LLM 없이 템플릿 검색어 사용
+    if settings.SEARCH_QUERY_MODE == "template":
+        return template_search_queries(topic, role)
+
+    # 같거나 비슷한 주제로 만든 검색어가 있으면 재사용
+    embed = get_embeddings().embed_query if settings.QUERY_CACHE_SEMANTIC else None
+    try:
+        cached_queries, topic_embedding = query_cache.lookup(topic, role, embed)
+    except Exception as e:
+        st.warning(f"검색어 캐시 조회 중 오류 발생: {str(e)}")
+        cached_queries, topic_embedding = None, None
+    if cached_queries:
+        return cached_queries
+
     template = "'{topic}'에 대해 {perspective} 웹검색에 적합한 3개의 검색어를 제안해주세요. 각 검색어는 25자 이내로 작성하고 콤마로 구분하세요. 검색어만 제공하고 설명은 하지 마세요."
 
     perspective_map = {
@@ -28,62 +70,117 @@ def improve_search_query(
         HumanMessage(content=prompt),
     ]
 
-    # 스트리밍 응답 받기
-    response = get_llm().invoke(messages)
+    # 스트리밍 응답 받기 (레이트 리밋/재시도 적용)
+    response = call_llm(messages, lambda: get_llm().invoke(messages))
 
     # ,로 구분된 검색어 추출
-    suggested_queries = [q.strip() for q in response.content.split(",")]
+    suggested_queries = [q.strip() for q in response.content.split(",")][:3]
+
+    try:
+        query_cache.set(topic, role, suggested_queries, topic_embedding)
+    except Exception as e:
+        st.warning(f"검색어 캐시 저장 중 오류 발생: {str(e)}")
+
+    return suggested_queries
+
+
+def get_query_cache_stats() -> Dict[str, Any]:
+    return query_cache.stats()
 
-    return suggested_queries[:3]
+
+def _search_query(
+    query: str, language: str, max_results: int, timeout: float
+) -> List[Dict[str, Any]]:
+    # DDGS는 스레드 간에 공유하지 않고 검색어마다 생성
+    results = DDGS(timeout=timeout).text(
+        query,
+        region=language,
+        safesearch="moderate",
+        timelimit="y",  # 최근 1년 내 결과
+        max_results=max_results,
+    )
+    return results or []
+
+
+def _normalize_body(body: str) -> str:
+    return " ".join(body.split()).lower()
 
 
 def get_search_content(
-    improved_queries: str,
+    improved_queries: List[str],
     language: str = "ko",
     max_results: int = 5,
 ) -> List[Document]:
 
     try:
+        # 각 개선된 검색어에 대해 동시에 검색 수행
+        futures = {
+            _search_executor.submit(
+                _search_query,
+                query,
+                language,
+                max_results,
+                settings.SEARCH_QUERY_TIMEOUT,
+            ): query
+            for query in improved_queries
+        }
+
+        # 전체 마감 시간까지 끝난 검색 결과만 사용 (부분 결과 허용)
+        done, not_done = wait(futures, timeout=settings.SEARCH_TOTAL_DEADLINE)
+        for future in not_done:
+            future.cancel()
+        if not_done:
+            st.warning(f"검색 시간 초과로 {len(not_done)}개 검색어 결과를 제외했습니다.")
+
         documents = []
+        # 이미 추가된 문서 (URL / 정규화된 본문 기준)
+        seen_urls: Dict[str, Document] = {}
+        seen_bodies: Dict[str, Document] = {}
 
-        ddgs = DDGS()
+        # 검색어 순서를 유지하며 결과 처리
+        for future, query in futures.items():
+            if future not in done:
+                continue
 
-        # 각 개선된 검색어에 대해 검색 수행
-        for query in improved_queries:
             try:
-                # 검색 수행
-                results = ddgs.text(
-                    query,
-                    region=language,
-                    safesearch="moderate",
-                    timelimit="y",  # 최근 1년 내 결과
-                    max_results=max_results,
-                )
+                results = future.result()
+            except Exception as e:
+                st.warning(f"검색 중 오류 발생: {str(e)}")
+                continue
+
+            # 검색 결과 처리
+            for result in results:
+                title = result.get("title", "")
+                body = result.get("body", "")
+                url = result.get("href", "")
 
-                if not results:
+                if not body:
                     continue
 
-                # 검색 결과 처리
-                for result in results:
-                    title = result.get("title", "")
-                    body = result.get("body", "")
-                    url = result.get("href", "")
-
-                    if body:
-                        documents.append(
-                            Document(
-                                page_content=body,
-                                metadata={
-                                    "source": url,
-                                    "section": "content",
-                                    "topic": title,
-                                    "query": query,
-                                },
-                            )
-                        )
+                # URL 또는 본문이 같은 결과는 임베딩 전에 제거하고,
+                # 이를 찾은 검색어만 기존 문서에 기록
+                normalized_body = _normalize_body(body)
+                duplicate = seen_urls.get(url) if url else None
+                duplicate = duplicate or seen_bodies.get(normalized_body)
+                if duplicate:
+                    if query not in duplicate.metadata["queries"]:
+                        duplicate.metadata["queries"].append(query)
+                    continue
 
-            except Exception as e:
-                st.warning(f"검색 중 오류 발생: {str(e)}")
+                document = Document(
+                    page_content=body,
+                    metadata={
+                        "source": url,
+                        "section": "content",
+                        "topic": title,
+                        "query": query,
+                        "queries": [query],  # 이 문서를 찾은 모든 검색어
+                    },
+                )
+                if url:
+                    seen_urls[url] = document
+                seen_bodies[normalized_body] = document
+                documents.append(document)
 
         return documents
 
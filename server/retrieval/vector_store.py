@@ -1,35 +1,182 @@
 import streamlit as st
+from concurrent.futures import Future, ThreadPoolExecutor
 from langchain_community.vectorstores import FAISS
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Hashable, Optional, List, Union
+from retrieval.cache import RetrievalCache
+from retrieval.dense_index import NumpyVectorStore
+from retrieval.index_store import VectorIndexStore
 from retrieval.search_service import get_search_content, improve_search_query
-from utils.config import get_embeddings
+from utils.config import get_embeddings, settings
+from utils.single_flight import SingleFlight
+from workflow.state import AgentType
 
+# 토론 간에 공유되는 검색 결과 캐시 (프로세스 단위)
+retrieval_cache = RetrievalCache(
+    max_size=settings.RETRIEVAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.RETRIEVAL_CACHE_TTL,
+)
 
-def get_topic_vector_store(
-    topic: str, role: str, language: str = "ko"
-) -> Optional[FAISS]:
+# 재시작 및 워커 간에 공유되는 디스크 인덱스 저장소
+index_store = VectorIndexStore(
+    directory=settings.INDEX_STORE_DIR,
+    max_age_seconds=settings.INDEX_STORE_MAX_AGE,
+    max_bytes=settings.INDEX_STORE_MAX_BYTES,
+)
+
+# 검색 파이프라인(검색어 개선, 웹 검색, 인덱싱)을 미리 실행하는 스레드 풀
+_prefetch_executor = ThreadPoolExecutor(
+    max_workers=settings.PREFETCH_MAX_WORKERS, thread_name_prefix="retrieval-prefetch"
+)
+# 진행 중인 작업 - 같은 키의 동시 요청은 하나의 Future를 기다림
+index_flight = SingleFlight()  # (주제, 언어)별 공유 인덱스 빌드
+query_flight = SingleFlight()  # (주제, 역할, 언어)별 검색어 개선
+
+# 모든 역할이 공유하는 주제 인덱스를 나타내는 키 값
+SHARED_INDEX_ROLE = "ALL"
+INDEX_ROLES = [AgentType.PRO, AgentType.CON, AgentType.JUDGE]
+
+# 문서 수에 따라 NumPy(소규모) 또는 FAISS(대규모) 벡터 스토어 사용
+TopicVectorStore = Union[NumpyVectorStore, FAISS]
+
+
+def build_topic_vector_store(
+    topic: str, language: str = "ko"
+) -> Optional[TopicVectorStore]:
+
+    # 역할별 검색어 개선 (LLM 호출은 동시에 실행)
+    with ThreadPoolExecutor(max_workers=len(INDEX_ROLES)) as executor:
+        futures = {
+            role: executor.submit(
+                query_flight.do,
+                RetrievalCache.make_key(topic, role, language),
+                improve_search_query,
+                topic,
+                role,
+            )
+            for role in INDEX_ROLES
+        }
+
+    query_roles: Dict[str, List[str]] = {}
+    for role, future in futures.items():
+        for query in future.result():
+            query_roles.setdefault(query, []).append(role)
 
-    # 검색어 개선
-    improved_queries = improve_search_query(topic, role)
-    # 개선된 검색어로 검색 콘텐츠 가져오기
-    documents = get_search_content(improved_queries, language)
+    # 모든 역할의 검색어로 한 번에 검색 - 중복 문서는 하나로 합쳐짐
+    documents = get_search_content(list(query_roles), language)
     if not documents:
         return None
+
+    # 문서를 찾은 검색어의 역할을 태그로 기록하여 역할별 필터링에 사용
+    for document in documents:
+        roles = []
+        for query in document.metadata.get("queries", []):
+            for role in query_roles.get(query, []):
+                if role not in roles:
+                    roles.append(role)
+        document.metadata["roles"] = roles
+
     try:
+        # 소규모 코퍼스는 인덱스 구축 비용이 없는 NumPy 검색이 더 빠름
+        if len(documents) <= settings.DENSE_INDEX_MAX_DOCS:
+            return NumpyVectorStore.from_documents(documents, get_embeddings())
         return FAISS.from_documents(documents, get_embeddings())
     except Exception as e:
         st.error(f"Vector DB 생성 중 오류 발생: {str(e)}")
         return None
 
 
-def search_topic(topic: str, role: str, query: str, k: int = 5) -> List[Dict[str, Any]]:
-    # 문서를 검색해서 벡터 스토어 생성
-    vector_store = get_topic_vector_store(topic, role)
+def load_or_build_topic_vector_store(
+    topic: str, language: str = "ko"
+) -> Optional[TopicVectorStore]:
+    role = SHARED_INDEX_ROLE
+
+    # 디스크에 저장된 인덱스가 있으면 검색/임베딩 없이 로드
+    try:
+        vector_store = index_store.load(topic, role, language, get_embeddings())
+    except Exception as e:
+        st.warning(f"저장된 인덱스 로드 중 오류 발생: {str(e)}")
+        vector_store = None
+    if vector_store is not None:
+        return vector_store
+
+    vector_store = build_topic_vector_store(topic, language)
+    if vector_store is not None:
+        try:
+            index_store.save(topic, role, language, vector_store)
+        except Exception as e:
+            st.warning(f"인덱스 저장 중 오류 발생: {str(e)}")
+    return vector_store
+
+
+def _build_and_cache(
+    key: Hashable, topic: str, language: str
+) -> Optional[TopicVectorStore]:
+    # 빌드를 시작한 호출(리더)만 실행하므로 캐시 미스도 여기서 한 번만 기록됨
+    return retrieval_cache.get_or_build(
+        key, lambda: load_or_build_topic_vector_store(topic, language)
+    )
+
+
+def prefetch_topic_vector_store(topic: str, language: str = "ko") -> Future:
+    """주제 공유 벡터 스토어 빌드를 백그라운드에서 시작하고 결과 Future를 반환합니다."""
+
+    key = RetrievalCache.make_key(topic, SHARED_INDEX_ROLE, language)
+
+    # 진행 중인 빌드에 합류하는 호출은 미스로 세지 않음 (미스는 빌드 리더가 기록)
+    vector_store = retrieval_cache.get(key, count_miss=False)
+    if vector_store is not None:
+        future = Future()
+        future.set_result(vector_store)
+        return future
+
+    return index_flight.submit(
+        key, _prefetch_executor, _build_and_cache, key, topic, language
+    )
+
+
+def get_topic_vector_store(
+    topic: str, language: str = "ko"
+) -> Optional[TopicVectorStore]:
+    # 같은 (주제, 언어)에 대해서는 캐시된 벡터 스토어 재사용,
+    # 미리 시작된 빌드가 있으면 그 결과를 기다림
+    return prefetch_topic_vector_store(topic, language).result()
+
+
+def search_topic(
+    topic: str, role: str, query: str, k: int = 5, language: str = "ko"
+) -> List[Dict[str, Any]]:
+    # 주제 공유 벡터 스토어 (캐시 적중 시 재사용)
+    vector_store = get_topic_vector_store(topic, language)
     if not vector_store:
         return []
     try:
-        # 벡터 스토어에서 Similarity Search 수행
-        return vector_store.similarity_search(query, k=k)
+        # 해당 역할의 검색어로 찾은 문서 중에서 MMR 검색 수행 (중복 문서 방지)
+        docs = vector_store.max_marginal_relevance_search(
+            query,
+            k=k,
+            fetch_k=settings.RETRIEVAL_FETCH_K,
+            lambda_mult=settings.RETRIEVAL_MMR_LAMBDA,
+            filter=lambda metadata: role in metadata.get("roles", []),
+        )
+        # 역할 태그가 붙은 문서가 없으면 전체 문서에서 검색
+        return docs or vector_store.max_marginal_relevance_search(
+            query,
+            k=k,
+            fetch_k=settings.RETRIEVAL_FETCH_K,
+            lambda_mult=settings.RETRIEVAL_MMR_LAMBDA,
+        )
     except Exception as e:
         st.error(f"검색 중 오류 발생: {str(e)}")
         return []
+
+
+def get_retrieval_cache_stats() -> Dict[str, Any]:
+    return retrieval_cache.stats()
+
+
+def get_index_store_stats() -> Dict[str, Any]:
+    return index_store.stats()
+
+
+def get_single_flight_stats() -> Dict[str, Any]:
+    return {"index_builds": index_flight.stats(), "search_queries": query_flight.stats()}
@@ -1,35 +1,149 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
 
-from db.database import get_db
-from db.models import Debate as DebateModel
-from db.schemas import DebateSchema, DebateCreate
+from db.database import get_async_db
+from db.repository import (
+    delete_debate,
+    delete_debates,
+    get_debate,
+    list_debate_summaries,
+    list_debates,
+    save_debate,
+    save_debates_bulk,
+)
+from db.schemas import (
+    DebateBatchCreate,
+    DebateBatchCreateResult,
+    DebateCreate,
+    DebateDeleteResult,
+    DebateIdList,
+    DebateSchema,
+    DebateSearchPage,
+    DebateSummaryPage,
+)
+from db.search import search_debates
+from db.storage import assemble_debate
+from workflow.checkpoint import delete_checkpoints
 
 router = APIRouter(prefix="/api/v1", tags=["debates"])
 
+# 이력 API는 비동기 세션(aiosqlite)을 사용하고, 저장소 함수는 run_sync로 재사용
+
 
 # 토론 목록 조회
 @router.get("/debates/", response_model=List[DebateSchema])
-def read_debates(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    debates = db.query(DebateModel).offset(skip).limit(limit).all()
-    return debates
+async def read_debates(
+    skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)
+):
+    return await db.run_sync(list_debates, skip, limit)
+
+
+# 토론 요약 목록 조회 (messages/docs 제외, 키셋 페이지네이션)
+@router.get("/debates/summary", response_model=DebateSummaryPage)
+async def read_debate_summaries(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    topic_prefix: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        items, next_cursor = await db.run_sync(
+            list_debate_summaries, limit, cursor, topic_prefix
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+
+# 토론 전문 검색 (주제 + 발언 내용, 관련도순)
+@router.get("/debates/search", response_model=DebateSearchPage)
+async def search_debate_history(
+    q: str,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        items, next_offset = await db.run_sync(search_debates, q, limit, offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_offset": next_offset}
 
 
 # 토론 생성
 @router.post("/debates/", response_model=DebateSchema)
-def create_debate(debate: DebateCreate, db: Session = Depends(get_db)):
-    db_debate = DebateModel(**debate.model_dump())
-    db.add(db_debate)
-    db.commit()
-    db.refresh(db_debate)
+async def create_debate(debate: DebateCreate, db: AsyncSession = Depends(get_async_db)):
+    # session_id가 같으면 기존 토론을 반환 (중복 저장 방지)
+    try:
+        db_debate = await db.run_sync(
+            lambda session: assemble_debate(save_debate(session, **debate.model_dump()))
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # 이력에 저장된 토론은 더 이상 재개할 필요가 없으므로 체크포인트 삭제
+    if debate.session_id:
+        await run_in_threadpool(delete_checkpoints, debate.session_id)
     return db_debate
 
 
+# 토론 일괄 생성 (한 트랜잭션)
+@router.post("/debates/batch", response_model=DebateBatchCreateResult)
+async def create_debates(
+    batch: DebateBatchCreate, db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        ids = await db.run_sync(
+            save_debates_bulk, [debate.model_dump() for debate in batch.debates]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except IntegrityError:
+        # 같은 session_id의 토론이 동시에 저장된 경우
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Debate already exists")
+
+    for debate in batch.debates:
+        if debate.session_id:
+            await run_in_threadpool(delete_checkpoints, debate.session_id)
+    return {"ids": ids}
+
+
+# ID 목록으로 토론 일괄 삭제 (한 번의 DELETE 문)
+@router.post("/debates/batch-delete", response_model=DebateDeleteResult)
+async def delete_debates_by_ids(
+    request: DebateIdList, db: AsyncSession = Depends(get_async_db)
+):
+    return {"deleted": await db.run_sync(delete_debates, request.ids)}
+
+
+# 조건으로 토론 일괄 삭제 - 조건 없이 전체 삭제하려면 all=true 필요
+# before: 이 시각 이전에 생성된 토론 삭제 (시간대가 없으면 UTC로 간주)
+@router.delete("/debates/", response_model=DebateDeleteResult)
+async def delete_debates_by_filter(
+    topic_prefix: Optional[str] = None,
+    before: Optional[datetime] = None,
+    all: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
+    if not (topic_prefix or before or all):
+        raise HTTPException(
+            status_code=400, detail="Specify topic_prefix, before or all=true"
+        )
+    deleted = await db.run_sync(
+        delete_debates, topic_prefix=topic_prefix, before=before
+    )
+    return {"deleted": deleted}
+
+
 # 토론 조회
 @router.get("/debates/{debate_id}", response_model=DebateSchema)
-def read_debate(debate_id: int, db: Session = Depends(get_db)):
-    db_debate = db.query(DebateModel).filter(DebateModel.id == debate_id).first()
+async def read_debate(debate_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_debate = await db.run_sync(get_debate, debate_id)
     if db_debate is None:
         raise HTTPException(status_code=404, detail="Debate not found")
     return db_debate
@@ -37,11 +151,9 @@ def read_debate(debate_id: int, db: Session = Depends(get_db)):
 
 # 토론 삭제
 @router.delete("/debates/{debate_id}")
-def delete_debate(debate_id: int, db: Session = Depends(get_db)):
-    db_debate = db.query(DebateModel).filter(DebateModel.id == debate_id).first()
-    if db_debate is None:
+async def delete_debate_by_id(
+    debate_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    if not await db.run_sync(delete_debate, debate_id):
         raise HTTPException(status_code=404, detail="Debate not found")
-
-    db.delete(db_debate)
-    db.commit()
     return {"detail": "Debate successfully deleted"}
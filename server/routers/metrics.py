@@ -0,0 +1,31 @@
+from fastapi import APIRouter
+
+from utils.config import http_clients, rate_limiters
+from utils.embedding_cache import get_embedding_cache_stats
+from retrieval.search_service import get_query_cache_stats
+from retrieval.vector_store import (
+    get_index_store_stats,
+    get_retrieval_cache_stats,
+    get_single_flight_stats,
+)
+from routers.workflow import debate_broadcaster, debate_scheduler
+from workflow.cancellation import cancellations
+
+router = APIRouter(prefix="/api/v1/metrics", tags=["metrics"])
+
+
+# 캐시 등 성능 관련 지표 조회
+@router.get("/")
+def read_metrics():
+    return {
+        "retrieval_cache": get_retrieval_cache_stats(),
+        "index_store": get_index_store_stats(),
+        "embedding_cache": get_embedding_cache_stats(),
+        "query_cache": get_query_cache_stats(),
+        "http_clients": http_clients.stats(),
+        "rate_limiters": rate_limiters.stats(),
+        "debates": cancellations.stats(),
+        "scheduler": debate_scheduler.stats(),
+        "single_flight": get_single_flight_stats(),
+        "debate_coalescing": debate_broadcaster.stats(),
+    }
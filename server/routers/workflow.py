@@ -1,15 +1,29 @@
-from typing import Any
+from typing import Any, Dict, Literal, Optional
 import uuid
 import json
-import asyncio
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTasks
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from langfuse.callback import CallbackHandler
 
 
+from db.database import SessionLocal
+from db.repository import save_debate_state
+from utils.config import settings
+from workflow.broadcast import DebateBroadcaster
+from workflow.cancellation import cancellations
+from workflow.checkpoint import delete_checkpoints
 from workflow.state import AgentType, DebateState
-from workflow.graph import create_debate_graph
+from workflow.graph import get_debate_graph
+from workflow.scheduler import (
+    DebateOutcome,
+    DebateScheduler,
+    DebateTicket,
+    QueueFullError,
+)
+from workflow.streaming import astream_graph
 
 
 # API 경로를 /api/v1로 변경
@@ -20,10 +34,29 @@ router = APIRouter(
 )
 
 
+# 동시 실행 토론 수 제한 및 대기열 관리
+debate_scheduler = DebateScheduler(
+    max_concurrent=settings.MAX_CONCURRENT_DEBATES,
+    max_queued=settings.MAX_QUEUED_DEBATES,
+)
+
+# 같은 조건의 동시 토론 요청을 하나의 스트림으로 합치는 허브 (COALESCE_DEBATES)
+# 원래 요청의 대기 순번과 세션 ID는 늦게 합류한 구독자에게 재전송하지 않음
+debate_broadcaster = DebateBroadcaster(
+    replayable=lambda event: _event_type(event) not in ("queue", "session")
+)
+
+
 class WorkflowRequest(BaseModel):
     topic: str
     max_rounds: int = 3
     enable_rag: bool = True
+    # full: 매 턴 전체 상태 전송, delta: 스냅샷 이후 변경분만 전송
+    protocol: Literal["full", "delta"] = "full"
+
+
+class ResumeRequest(BaseModel):
+    protocol: Literal["full", "delta"] = "full"
 
 
 class WorkflowResponse(BaseModel):
@@ -31,24 +64,224 @@ class WorkflowResponse(BaseModel):
     result: Any = None
 
 
-async def debate_generator(debate_graph, initial_state, langfuse_handler):
-    # 그래프에서 청크 스트리밍
-    for chunk in debate_graph.stream(
-        initial_state,
-        config={"callbacks": [langfuse_handler]},
+def sse_event(event_data: Dict[str, Any]) -> str:
+    return f"data: {json.dumps(event_data, ensure_ascii=False)}\n\n"
+
+
+class DeltaEncoder:
+    """delta 프로토콜 - 새 메시지와 변경된 문서만 시퀀스 번호와 함께 인코딩"""
+
+    def __init__(self):
+        self.seq = 0
+        self._sent_docs: Dict[str, Any] = {}
+        self._sent_messages = 0
+
+    def snapshot(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        self._sent_docs = {role: list(docs) for role, docs in state["docs"].items()}
+        self._sent_messages = len(state["messages"])
+        return {
+            "type": "snapshot",
+            "seq": self.seq,
+            "data": {
+                "topic": state["topic"],
+                "max_rounds": state["max_rounds"],
+                "current_round": state["current_round"],
+                "messages": state["messages"],
+                "docs": state["docs"],
+            },
+        }
+
+    def delta(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        self.seq += 1
+
+        # 마지막 전송 이후 추가된 메시지만 포함
+        new_messages = state["messages"][self._sent_messages :]
+        self._sent_messages = len(state["messages"])
+
+        # 내용이 바뀐 역할의 문서만 포함
+        changed_docs = {}
+        for role, docs in state["docs"].items():
+            if self._sent_docs.get(role) != docs:
+                changed_docs[role] = docs
+                self._sent_docs[role] = list(docs)
+
+        return {
+            "type": "delta",
+            "seq": self.seq,
+            "data": {
+                "role": state["role"],
+                "response": state["response"],
+                "current_round": state["current_round"],
+                "max_rounds": state["max_rounds"],
+                "messages": new_messages,
+                "docs": changed_docs,
+            },
+        }
+
+
+async def debate_generator(
+    debate_graph,
+    initial_state,
+    config: Dict[str, Any],
+    cancel_event,
+    protocol: str = "full",
+    request: Request = None,
+    resume: bool = False,
+):
+    # cancel_event: 요청 시점에 cancellations.try_register로 등록한 실행의 취소 신호
+    session_id = config["configurable"]["session_id"]
+
+    # 재개에 사용할 세션 ID를 먼저 전달
+    yield sse_event({"type": "session", "data": {"session_id": session_id}})
+
+    # 그래프는 스레드 풀에서 실행하고 청크만 비동기로 받아 스트리밍
+    # 재개 시에는 입력 없이 마지막 체크포인트부터 이어서 실행
+    stream = astream_graph(
+        debate_graph,
+        None if resume else initial_state,
+        config=config,
+        cancel_event=cancel_event,
         subgraphs=True,
-        stream_mode="updates",
-    ):
+        stream_mode=["updates", "custom"],
+    )
+    events = _debate_events(stream, initial_state, protocol, replay=resume)
+    completed = False
+    error = None
+
+    try:
+        try:
+            async for event_data in events:
+                # 클라이언트 연결이 끊기면 남은 라운드를 실행하지 않고 중단
+                if request is not None and await request.is_disconnected():
+                    break
+                yield sse_event(event_data)
+            else:
+                completed = True
+        except Exception as e:
+            # 그래프 실행 오류(LLM/검색 실패 등)는 취소가 아니므로 오류 이벤트로 전달
+            error = e
+    finally:
+        # 연결 종료나 소비자 조기 종료일 때만 진행 중인 그래프와 LLM 요청 취소
+        if not completed and error is None:
+            cancellations.cancel(session_id)
+        cancellations.release(session_id, cancel_event)
+        await events.aclose()
+        await stream.aclose()
+
+    if error is not None:
+        yield sse_event(
+            {"type": "error", "data": {"message": f"토론 진행 중 오류 발생: {str(error)}"}}
+        )
+
+    # 완료된 토론을 서버에서 저장하고 종료 메시지에 토론 ID 전달
+    # (DB 작업은 스레드 풀에서 실행하여 이벤트 루프를 막지 않음)
+    if completed:
+        end_data = {"debate_id": None}
+        try:
+            end_data["debate_id"] = await run_in_threadpool(
+                _persist_debate, debate_graph, config
+            )
+        except Exception as e:
+            end_data["error"] = f"토론 저장 중 오류 발생: {str(e)}"
+        yield sse_event({"type": "end", "data": end_data})
+
+
+def _persist_debate(debate_graph, config: Dict[str, Any]) -> Optional[int]:
+    """그래프의 최종 상태를 이력에 저장하고 토론 ID를 반환합니다. (session_id 기준 멱등)"""
+
+    snapshot = debate_graph.get_state(config)
+    # 취소 등으로 끝까지 실행되지 않은 토론은 저장하지 않음 (재개 가능하도록 체크포인트 유지)
+    if snapshot.next or not snapshot.values:
+        return None
+
+    session_id = config["configurable"]["session_id"]
+    db = SessionLocal()
+    try:
+        debate_id = save_debate_state(db, snapshot.values, session_id).id
+    finally:
+        db.close()
+
+    # 이력에 저장된 토론은 더 이상 재개할 필요가 없으므로 체크포인트 삭제
+    delete_checkpoints(session_id)
+    return debate_id
+
+
+async def scheduled_generator(ticket: DebateTicket, stream):
+    # end/error 이벤트 없이 끝나면 연결 종료 등으로 취소된 것으로 봄
+    outcome = DebateOutcome.CANCELLED
+    try:
+        # 실행 슬롯이 날 때까지 대기 순번 전달
+        async for position in debate_scheduler.wait(ticket):
+            yield sse_event({"type": "queue", "data": {"position": position}})
+
+        async for event in stream:
+            outcome = _event_outcome(event) or outcome
+            yield event
+    finally:
+        debate_scheduler.release(ticket, outcome)
+        await stream.aclose()
+
+
+def _event_outcome(event: str) -> Optional[str]:
+    """토론 종료를 알리는 SSE 이벤트면 결과(DebateOutcome)를 반환합니다."""
+
+    event_type = _event_type(event)
+    if event_type == "end":
+        return DebateOutcome.COMPLETED
+    if event_type == "error":
+        return DebateOutcome.FAILED
+    return None
+
+
+def _event_type(event: str) -> Optional[str]:
+    return json.loads(event[len("data: ") :]).get("type")
+
+
+def _replay_events(state: Dict[str, Any]):
+    """체크포인트에 저장된 완료 발언을 update 이벤트로 다시 만듭니다."""
+
+    messages = state["messages"]
+    for i, message in enumerate(messages):
+        yield {
+            "type": "update",
+            "data": {
+                "role": message["role"],
+                "response": message["content"],
+                "topic": state["topic"],
+                "messages": messages[: i + 1],
+                "current_round": message.get("current_round", state["current_round"]),
+                "max_rounds": state["max_rounds"],
+                "docs": state["docs"],
+            },
+        }
+
+
+async def _debate_events(stream, initial_state, protocol: str, replay: bool = False):
+    encoder = DeltaEncoder() if protocol == "delta" else None
+    if encoder:
+        # 재개 시 스냅샷에 완료된 발언이 모두 포함됨
+        yield encoder.snapshot(initial_state)
+    elif replay:
+        for event in _replay_events(initial_state):
+            yield event
+
+    async for chunk in stream:
         if not chunk:
             continue
 
-        node = chunk[0] if len(chunk) > 0 else None
+        # subgraphs=True + 다중 stream_mode => (namespace, mode, data)
+        node, mode, subgraph = chunk
         if not node or node == ():
             continue
 
+        # 에이전트 내부에서 생성되는 LLM 토큰을 바로 전달
+        if mode == "custom":
+            if subgraph.get("type") == "token":
+                yield {"type": "token", "data": subgraph.get("data", {})}
+            continue
+
         node_name = node[0]
         role = node_name.split(":")[0]
-        subgraph = chunk[1]
         subgraph_node = subgraph.get("update_state", None)
 
         if subgraph_node:
@@ -70,39 +303,140 @@ async def debate_generator(debate_graph, initial_state, langfuse_handler):
                 "docs": docs,
             }
 
-            event_data = {"type": "update", "data": state}
-            yield f"data: {json.dumps(event_data, ensure_ascii=False)}\n\n"
-            print(event_data)
-
-            await asyncio.sleep(0.01)
-
-    # 디베이트 종료 메시지
-    yield f"data: {json.dumps({'type': 'end', 'data': {}}, ensure_ascii=False)}\n\n"
+            if encoder:
+                yield encoder.delta(state)
+            else:
+                yield {"type": "update", "data": state}
 
 
 # 엔드포인트 경로 수정 (/debate/stream -> 유지)
 @router.post("/debate/stream")
-async def stream_debate_workflow(request: WorkflowRequest):
+async def stream_debate_workflow(request: WorkflowRequest, http_request: Request):
     topic = request.topic
     max_rounds = request.max_rounds
     enable_rag = request.enable_rag
 
+    # 같은 주제/라운드/RAG 설정의 토론이 진행 중이면 구독자로 합류
+    coalesce_key = None
+    if settings.COALESCE_DEBATES:
+        coalesce_key = (
+            " ".join(topic.split()).lower(),
+            max_rounds,
+            enable_rag,
+            request.protocol,
+        )
+        subscriber = debate_broadcaster.attach(coalesce_key)
+        if subscriber is not None:
+            return StreamingResponse(subscriber, media_type="text/event-stream")
+
     session_id = str(uuid.uuid4())
-    debate_graph = create_debate_graph(enable_rag, session_id)
+    # 미리 컴파일된 그래프 템플릿 재사용
+    debate_graph = get_debate_graph(enable_rag)
 
     initial_state: DebateState = {
         "topic": topic,
         "messages": [],
         "current_round": 1,
         "max_rounds": max_rounds,
+        "enable_rag": enable_rag,
         "prev_node": "START",  # 이전 노드 START로 설정
         "docs": {},  # RAG 결과 저장
+        "summary": "",  # 오래된 라운드의 누적 요약
+        "summarized_round": 0,
     }
 
-    langfuse_handler = CallbackHandler(session_id=session_id)
+    cancel_event = cancellations.register(session_id, _remaining_turns(initial_state))
+    # 대기열이 가득 차면 바로 거절
+    ticket = _enqueue_or_reject(session_id, cancel_event)
 
     # 스트리밍 응답 반환
+    # 합류한 구독자가 있을 수 있으므로 연결 종료는 허브에서 구독자 단위로 처리
+    stream = debate_generator(
+        debate_graph,
+        initial_state,
+        _debate_config(session_id),
+        cancel_event,
+        request.protocol,
+        None if coalesce_key else http_request,
+    )
+    if coalesce_key:
+        # 슬롯은 토론이 끝나면 scheduled_generator에서 반환
+        return StreamingResponse(
+            debate_broadcaster.start(coalesce_key, scheduled_generator(ticket, stream)),
+            media_type="text/event-stream",
+        )
+    return _scheduled_response(ticket, stream, session_id, cancel_event)
+
+
+# 중단된 토론을 마지막 체크포인트부터 재개
+@router.post("/debate/{session_id}/resume")
+async def resume_debate_workflow(
+    session_id: str, http_request: Request, request: ResumeRequest = ResumeRequest()
+):
+    # 체크포인트는 두 그래프 템플릿이 공유하므로 어느 쪽에서든 조회 가능
+    config = _debate_config(session_id)
+    snapshot = await run_in_threadpool(get_debate_graph(True).get_state, config)
+    if not snapshot.values:
+        raise HTTPException(status_code=404, detail="Checkpoint not found")
+
+    state = snapshot.values
+    debate_graph = get_debate_graph(state.get("enable_rag", True))
+
+    # 확인과 등록을 한 번에 수행 - 동시 재개나 아직 대기/실행 중인 원래 스트림과
+    # 같은 체크포인트(thread_id)에 두 그래프가 동시에 쓰지 않도록 함
+    cancel_event = cancellations.try_register(session_id, _remaining_turns(state))
+    if cancel_event is None:
+        raise HTTPException(status_code=409, detail="Debate is still running")
+    ticket = _enqueue_or_reject(session_id, cancel_event)
+
+    # 완료된 발언을 먼저 재전송한 뒤 남은 노드를 이어서 스트리밍
+    stream = debate_generator(
+        debate_graph,
+        state,
+        config,
+        cancel_event,
+        request.protocol,
+        http_request,
+        resume=True,
+    )
+    return _scheduled_response(ticket, stream, session_id, cancel_event)
+
+
+def _remaining_turns(state: Dict[str, Any]) -> int:
+    # 남은 찬성/반대 발언 x 라운드 수 + 심판 발언
+    return state["max_rounds"] * 2 + 1 - len(state["messages"])
+
+
+def _enqueue_or_reject(session_id: str, cancel_event) -> DebateTicket:
+    try:
+        return debate_scheduler.enqueue()
+    except QueueFullError as e:
+        cancellations.release(session_id, cancel_event)
+        raise HTTPException(
+            status_code=503,
+            detail="Too many debates in progress",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+def _debate_config(session_id: str) -> Dict[str, Any]:
+    langfuse_handler = CallbackHandler(session_id=session_id)
+    return {
+        "callbacks": [langfuse_handler],
+        # thread_id: 체크포인트 키
+        "configurable": {"session_id": session_id, "thread_id": session_id},
+    }
+
+
+def _scheduled_response(
+    ticket: DebateTicket, stream, session_id: str, cancel_event
+) -> StreamingResponse:
+    # 스트림이 시작되지 못한 경우에도 슬롯과 세션 등록이 반환되도록 보장 (중복 호출 안전)
+    background = BackgroundTasks()
+    background.add_task(debate_scheduler.release, ticket)
+    background.add_task(cancellations.release, session_id, cancel_event)
     return StreamingResponse(
-        debate_generator(debate_graph, initial_state, langfuse_handler),
+        scheduled_generator(ticket, stream),
         media_type="text/event-stream",
+        background=background,
     )
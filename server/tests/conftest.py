@@ -0,0 +1,19 @@
+import os
+import sys
+
+# 서버 코드는 server/ 디렉토리 기준의 절대 경로로 import 함
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 설정 로드에 필요한 환경 변수 (테스트에서는 외부 서비스를 호출하지 않음)
+for name, value in {
+    "AOAI_API_KEY": "test",
+    "AOAI_ENDPOINT": "https://test.openai.azure.com",
+    "AOAI_DEPLOY_GPT4O": "test",
+    "AOAI_EMBEDDING_DEPLOYMENT": "test",
+    "AOAI_API_VERSION": "2024-02-01",
+    "LANGFUSE_PUBLIC_KEY": "test",
+    "LANGFUSE_SECRET_KEY": "test",
+    "LANGFUSE_HOST": "http://localhost",
+    "API_BASE_URL": "http://localhost",
+}.items():
+    os.environ.setdefault(name, value)
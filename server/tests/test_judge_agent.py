@@ -0,0 +1,63 @@
+import pytest
+
+from workflow import history
+from workflow.agents.judge_agent import JudgeAgent
+from workflow.state import AgentType
+
+
+@pytest.fixture(autouse=True)
+def word_tokens(monkeypatch):
+    # 토크나이저 파일을 내려받지 않도록 공백 단위로 토큰 수 계산
+    monkeypatch.setattr(history, "count_tokens", lambda text: len(text.split()))
+
+
+def _debate_state(**overrides):
+    state = {
+        "topic": "주4일제 도입",
+        "messages": [
+            {"role": AgentType.PRO, "content": "찬성 주장", "current_round": 3},
+            {"role": AgentType.CON, "content": "반대 주장", "current_round": 3},
+        ],
+        "current_round": 3,
+        "prev_node": AgentType.CON,
+        "max_rounds": 3,
+        "enable_rag": False,
+        "docs": {},
+        "contexts": {},
+        "summary": "1~2라운드 요약 내용",
+        "summarized_round": 2,
+    }
+    state.update(overrides)
+    return state
+
+
+def test_judge_messages_include_summary_once():
+    agent = JudgeAgent()
+    state = {"debate_state": _debate_state(), "context": "", "messages": [], "response": ""}
+
+    messages = agent._prepare_messages(state)["messages"]
+
+    text = "\n".join(message.content for message in messages)
+    assert text.count("1~2라운드 요약 내용") == 1
+    assert "찬성 주장" in text and "반대 주장" in text
+
+
+def test_messages_over_budget_are_summarized(monkeypatch):
+    folded = []
+
+    def fake_summarize(topic, summary, messages):
+        folded.extend(messages)
+        return f"{summary} + 예산 초과 발언 요약"
+
+    monkeypatch.setattr("workflow.agents.agent.summarize_rounds", fake_summarize)
+
+    agent = JudgeAgent()
+    agent.history_token_budget = 1
+    state = {"debate_state": _debate_state(), "context": "", "messages": [], "response": ""}
+
+    messages = agent._prepare_messages(state)["messages"]
+
+    text = "\n".join(message.content for message in messages)
+    assert [m["content"] for m in folded] == ["찬성 주장"]
+    assert text.count("예산 초과 발언 요약") == 1
+    assert "반대 주장" in text
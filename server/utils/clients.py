@@ -0,0 +1,66 @@
+import threading
+from typing import Any, Dict
+
+import httpx
+
+
+class HttpClientRegistry:
+    """배포(deployment)별로 커넥션 풀을 가진 httpx 클라이언트를 프로세스 단위로 공유하는 레지스트리
+
+    매 호출마다 새 클라이언트를 만들면 TLS 핸드셰이크와 연결 설정이 반복되므로
+    하나의 풀링된 클라이언트(동기/비동기)를 재사용하여 keep-alive 연결을 활용합니다.
+    """
+
+    def __init__(
+        self,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        timeout: float,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=10.0)
+        self._sync_clients: Dict[str, httpx.Client] = {}
+        self._async_clients: Dict[str, httpx.AsyncClient] = {}
+        self._lock = threading.Lock()
+
+    def get_sync(self, deployment: str) -> httpx.Client:
+        with self._lock:
+            client = self._sync_clients.get(deployment)
+            if client is None or client.is_closed:
+                client = httpx.Client(limits=self.limits, timeout=self.timeout)
+                self._sync_clients[deployment] = client
+            return client
+
+    def get_async(self, deployment: str) -> httpx.AsyncClient:
+        with self._lock:
+            client = self._async_clients.get(deployment)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+                self._async_clients[deployment] = client
+            return client
+
+    async def aclose(self) -> None:
+        with self._lock:
+            sync_clients = list(self._sync_clients.values())
+            async_clients = list(self._async_clients.values())
+            self._sync_clients.clear()
+            self._async_clients.clear()
+
+        for client in sync_clients:
+            client.close()
+        for client in async_clients:
+            await client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sync_clients": sorted(self._sync_clients),
+                "async_clients": sorted(self._async_clients),
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+            }
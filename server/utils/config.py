@@ -1,7 +1,11 @@
 import os
+from typing import Literal
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
+from utils.clients import HttpClientRegistry
+from utils.embedding_cache import CachedEmbeddings
+from utils.rate_limit import RateLimiterRegistry
 
 # .env 파일에서 환경 변수 로드
 load_dotenv()
@@ -28,6 +32,79 @@ class Settings(BaseSettings):
     # SQLite 데이터베이스 설정
     DB_PATH: str = "history.db"
     SQLALCHEMY_DATABASE_URI: str = f"sqlite:///./{DB_PATH}"
+    ASYNC_SQLALCHEMY_DATABASE_URI: str = f"sqlite+aiosqlite:///./{DB_PATH}"
+    # 연결 시 적용하는 SQLite 설정 (WAL 모드에서 읽기와 쓰기가 서로 막지 않음)
+    DB_BUSY_TIMEOUT_MS: int = 5000  # 쓰기 잠금 대기 시간
+    DB_MMAP_SIZE: int = 256 * 1024 * 1024  # 메모리 매핑 I/O 크기
+    # 커넥션 풀 설정
+    DB_POOL_SIZE: int = 8
+    DB_MAX_OVERFLOW: int = 16
+    # 참고 문서 본문 zstd 압축 (zstandard 패키지가 있을 때만 적용)
+    DB_COMPRESSION: bool = True
+    DB_COMPRESSION_LEVEL: int = 3
+    DB_COMPRESSION_MIN_BYTES: int = 256  # 이보다 짧은 문서는 압축하지 않음
+
+    # Azure OpenAI HTTP 커넥션 풀 설정
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0  # 초 단위
+    HTTP_TIMEOUT: float = 120.0  # 초 단위
+
+    # 웹 검색 설정
+    SEARCH_MAX_WORKERS: int = 16
+    SEARCH_QUERY_TIMEOUT: int = 8  # 검색어별 타임아웃 (초)
+    SEARCH_TOTAL_DEADLINE: float = 12.0  # 한 번의 검색 전체 마감 시간 (초)
+
+    # 검색어 생성 설정 - llm: LLM으로 검색어 개선, template: LLM 없이 템플릿 사용
+    SEARCH_QUERY_MODE: Literal["llm", "template"] = "llm"
+    QUERY_CACHE_PATH: str = "query_cache.db"
+    QUERY_CACHE_TTL: int = 7 * 24 * 3600  # 초 단위
+    QUERY_CACHE_SEMANTIC: bool = True  # 주제 임베딩 유사도 기반 캐시 사용 여부
+    QUERY_CACHE_SIMILARITY: float = 0.92  # 의미 기반 캐시 적중 임계값 (코사인 유사도)
+
+    # Azure OpenAI 레이트 리밋 및 재시도 설정 (배포별 할당량)
+    AOAI_GPT4O_RPM: int = 300
+    AOAI_GPT4O_TPM: int = 50000
+    AOAI_EMBEDDING_RPM: int = 300
+    AOAI_EMBEDDING_TPM: int = 150000
+    AOAI_MAX_RETRIES: int = 5
+    AOAI_BACKOFF_BASE: float = 1.0  # 초 단위
+    AOAI_BACKOFF_MAX: float = 30.0  # 초 단위
+    LLM_COMPLETION_TOKENS_ESTIMATE: int = 800  # TPM 계산에 사용하는 응답 토큰 추정치
+    # 스트리밍 응답에 실제 사용량 포함 (stream_options를 지원하는 API 버전 필요)
+    AOAI_STREAM_USAGE: bool = True
+
+    # 검색 결과(벡터 스토어) 캐시 설정
+    RETRIEVAL_CACHE_MAX_SIZE: int = 128
+    RETRIEVAL_CACHE_TTL: int = 3600  # 초 단위
+    PREFETCH_MAX_WORKERS: int = 16  # 검색 파이프라인 선행 실행 스레드 수
+    RETRIEVAL_FETCH_K: int = 20  # 역할 필터 적용 전 후보 문서 수
+    RETRIEVAL_MMR_LAMBDA: float = 0.5  # 1에 가까울수록 관련성, 0에 가까울수록 다양성 우선
+    DENSE_INDEX_MAX_DOCS: int = 256  # 이 문서 수 이하는 FAISS 대신 NumPy 검색 사용
+
+    # 디스크 벡터 인덱스 저장소 설정
+    INDEX_STORE_DIR: str = "vector_indexes"
+    INDEX_STORE_MAX_AGE: int = 365 * 24 * 3600  # 검색 기간(timelimit="y")과 동일
+    INDEX_STORE_MAX_BYTES: int = 512 * 1024 * 1024
+
+    # 토론 그래프 실행 스레드 수
+    DEBATE_WORKER_THREADS: int = 32
+
+    # 토론 스케줄러 설정 - 동시 실행 토론 수와 대기열 크기
+    MAX_CONCURRENT_DEBATES: int = 8
+    MAX_QUEUED_DEBATES: int = 32
+    # 같은 주제/라운드/RAG 설정의 동시 요청을 하나의 토론 스트림으로 합칠지 여부
+    COALESCE_DEBATES: bool = False
+
+    # 대화 기록 관리 설정
+    HISTORY_TOKENIZER: str = "o200k_base"  # gpt-4o 토크나이저
+    HISTORY_TOKEN_BUDGET: int = 2000  # 토론자 에이전트의 최근 대화 토큰 예산
+    JUDGE_HISTORY_TOKEN_BUDGET: int = 4000  # 심판 에이전트의 최근 대화 토큰 예산
+    HISTORY_WINDOW_ROUNDS: int = 2  # 요약하지 않고 그대로 유지할 최근 라운드 수
+    HISTORY_SUMMARY_MAX_CHARS: int = 800
+
+    # 임베딩 캐시 설정
+    EMBEDDING_CACHE_PATH: str = "embedding_cache.db"
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
@@ -40,21 +117,90 @@ class Settings(BaseSettings):
             api_version=self.AOAI_API_VERSION,
             temperature=0.7,
             streaming=True,  # 스트리밍 활성화
+            stream_usage=self.AOAI_STREAM_USAGE,
+            max_retries=0,  # 재시도는 rate_limiters에서 일괄 처리
+            http_client=http_clients.get_sync(self.AOAI_DEPLOY_GPT4O),
+            http_async_client=http_clients.get_async(self.AOAI_DEPLOY_GPT4O),
         )
 
     def get_embeddings(self):
-        """Azure OpenAI Embeddings 인스턴스를 반환합니다."""
-        return AzureOpenAIEmbeddings(
+        """텍스트 해시 캐시가 적용된 Azure OpenAI Embeddings 인스턴스를 반환합니다."""
+        embeddings = AzureOpenAIEmbeddings(
             model=self.AOAI_EMBEDDING_DEPLOYMENT,
             openai_api_version=self.AOAI_API_VERSION,
             api_key=self.AOAI_API_KEY,
             azure_endpoint=self.AOAI_ENDPOINT,
+            max_retries=0,  # 재시도는 rate_limiters에서 일괄 처리
+            http_client=http_clients.get_sync(self.AOAI_EMBEDDING_DEPLOYMENT),
+            http_async_client=http_clients.get_async(self.AOAI_EMBEDDING_DEPLOYMENT),
+        )
+        return CachedEmbeddings(
+            embeddings,
+            db_path=self.EMBEDDING_CACHE_PATH,
+            model=embeddings.model,
+            deployment=self.AOAI_EMBEDDING_DEPLOYMENT,
+            call_wrapper=self.call_embeddings,
+        )
+
+    def estimate_llm_tokens(self, messages):
+        """GPT-4o 호출 하나가 사용할 토큰 수(프롬프트 + 응답 추정치)를 계산합니다."""
+        return rate_limiters.estimate_tokens(
+            [message.content for message in messages],
+            self.LLM_COMPLETION_TOKENS_ESTIMATE,
+        )
+
+    def call_llm(self, messages, fn, tokens=None):
+        """GPT-4o 호출을 레이트 리미터와 재시도 정책을 거쳐 실행합니다."""
+        if tokens is None:
+            tokens = self.estimate_llm_tokens(messages)
+        return rate_limiters.call(
+            self.AOAI_DEPLOY_GPT4O, tokens, fn, usage=_llm_usage_tokens
+        )
+
+    def record_llm_usage(self, estimated, usage_metadata):
+        """스트리밍이 끝난 뒤 받은 실제 사용량으로 GPT-4o 토큰 추정치를 보정합니다."""
+        rate_limiters.reconcile(
+            self.AOAI_DEPLOY_GPT4O, estimated, usage_metadata["total_tokens"]
         )
 
+    def call_embeddings(self, texts, fn):
+        """임베딩 호출을 레이트 리미터와 재시도 정책을 거쳐 실행합니다."""
+        tokens = rate_limiters.estimate_tokens(texts)
+        return rate_limiters.call(self.AOAI_EMBEDDING_DEPLOYMENT, tokens, fn)
+
+
+# 응답에 포함된 실제 사용 토큰 수 (없으면 None)
+def _llm_usage_tokens(result):
+    usage_metadata = getattr(result, "usage_metadata", None)
+    return usage_metadata["total_tokens"] if usage_metadata else None
+
 
 # 설정 인스턴스 생성
 settings = Settings()
 
+# 배포별로 공유되는 HTTP 클라이언트 (FastAPI lifespan 종료 시 정리)
+http_clients = HttpClientRegistry(
+    max_connections=settings.HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    timeout=settings.HTTP_TIMEOUT,
+)
+
+# 배포별 RPM/TPM 레이트 리미터 및 재시도 정책
+rate_limiters = RateLimiterRegistry(
+    limits={
+        settings.AOAI_DEPLOY_GPT4O: (settings.AOAI_GPT4O_RPM, settings.AOAI_GPT4O_TPM),
+        settings.AOAI_EMBEDDING_DEPLOYMENT: (
+            settings.AOAI_EMBEDDING_RPM,
+            settings.AOAI_EMBEDDING_TPM,
+        ),
+    },
+    max_retries=settings.AOAI_MAX_RETRIES,
+    backoff_base=settings.AOAI_BACKOFF_BASE,
+    backoff_max=settings.AOAI_BACKOFF_MAX,
+    tokenizer=settings.HISTORY_TOKENIZER,
+)
+
 
 # 편의를 위한 함수들, 하위 호환성을 위해 유지
 def get_llm():
@@ -63,3 +209,7 @@ def get_llm():
 
 def get_embeddings():
     return settings.get_embeddings()
+
+
+def call_llm(messages, fn, tokens=None):
+    return settings.call_llm(messages, fn, tokens)
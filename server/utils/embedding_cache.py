@@ -0,0 +1,144 @@
+import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# 프로세스 전체에서 공유하는 캐시 통계와 초기화된 DB 경로
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+_initialized_paths = set()
+
+
+class CachedEmbeddings(Embeddings):
+    """텍스트 해시 기준으로 임베딩 벡터를 SQLite에 캐시하는 임베딩 래퍼
+
+    키는 (모델, 배포명, 텍스트)의 해시이며, 벡터는 float32 BLOB으로 저장합니다.
+    캐시에 없는 텍스트만 모아 한 번의 임베딩 요청으로 처리합니다.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        db_path: str,
+        model: str,
+        deployment: str,
+        call_wrapper: Optional[Callable[[List[str], Callable], Any]] = None,
+    ):
+        self.embeddings = embeddings
+        self.db_path = db_path
+        self.model = model
+        self.deployment = deployment
+        self.call_wrapper = call_wrapper  # 레이트 리밋/재시도 적용 함수
+
+        # 테이블 생성은 DB 파일당 한 번만 수행
+        with _stats_lock:
+            if db_path in _initialized_paths:
+                return
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS embedding_cache (
+                        key TEXT PRIMARY KEY,
+                        dim INTEGER NOT NULL,
+                        vector BLOB NOT NULL
+                    )
+                    """
+                )
+            _initialized_paths.add(db_path)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _key(self, text: str) -> str:
+        raw = f"{self.model}\x00{self.deployment}\x00{text}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._connect() as conn:
+            # SQLite 바인드 변수 제한을 넘지 않도록 나누어 조회
+            for i in range(0, len(unique_keys), 500):
+                chunk = unique_keys[i : i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embedding_cache WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def _store(self, items: Dict[str, List[float]]) -> None:
+        rows = []
+        for key, vector in items.items():
+            array = np.asarray(vector, dtype=np.float32)
+            rows.append((key, array.shape[0], array.tobytes()))
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (key, dim, vector) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        keys = [self._key(text) for text in texts]
+        try:
+            cached = self._lookup(keys)
+        except sqlite3.Error:
+            # 캐시 장애가 임베딩 자체를 막지 않도록 캐시 없이 진행
+            cached = {}
+
+        # 캐시에 없는 텍스트만 중복 없이 모아 한 번에 요청
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        miss_count = sum(1 for key in keys if key in missing)
+        with _stats_lock:
+            _stats["hits"] += len(texts) - miss_count
+            _stats["misses"] += miss_count
+
+        if missing:
+            texts_to_embed = list(missing.values())
+            if self.call_wrapper:
+                vectors = self.call_wrapper(
+                    texts_to_embed,
+                    lambda: self.embeddings.embed_documents(texts_to_embed),
+                )
+            else:
+                vectors = self.embeddings.embed_documents(texts_to_embed)
+            computed = dict(zip(missing.keys(), vectors))
+            try:
+                self._store(computed)
+            except sqlite3.Error:
+                pass
+            cached.update(computed)
+
+        return [cached[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def get_embedding_cache_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        total = _stats["hits"] + _stats["misses"]
+        return {
+            **_stats,
+            "hit_rate": round(_stats["hits"] / total, 4) if total else 0.0,
+        }
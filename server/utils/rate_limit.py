@@ -0,0 +1,271 @@
+import email.utils
+import random
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, TypeVar
+
+import openai
+import tiktoken
+
+T = TypeVar("T")
+
+# 재시도할 HTTP 상태 코드 (5xx는 별도로 처리)
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+class DeploymentRateLimiter:
+    """배포 하나에 대한 분당 요청 수(RPM)/토큰 수(TPM) 토큰 버킷
+
+    호출자는 번호표 순서(FIFO)대로 대기하므로 큰 요청이 계속 밀려나지 않습니다.
+    """
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._available_requests = float(rpm)
+        self._available_tokens = float(tpm)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._serving_ticket = 0
+
+        # 통계 카운터
+        self.requests = 0
+        self.throttled_requests = 0
+        self.throttled_seconds = 0.0
+        self.retries = 0
+        self.rate_limited = 0  # 서버에서 받은 429 응답 수
+        self.reconciled_tokens = 0  # 실제 사용량 보정으로 돌려준 토큰 수 (음수면 추가 차감)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._available_requests = min(
+            self.rpm, self._available_requests + elapsed * self.rpm / 60
+        )
+        self._available_tokens = min(
+            self.tpm, self._available_tokens + elapsed * self.tpm / 60
+        )
+
+    def _wait_seconds(self, tokens: int, now: float) -> float:
+        wait = self._paused_until - now
+        if self._available_requests < 1:
+            wait = max(wait, (1 - self._available_requests) * 60 / self.rpm)
+        if self._available_tokens < tokens:
+            wait = max(wait, (tokens - self._available_tokens) * 60 / self.tpm)
+        return wait
+
+    def acquire(self, tokens: int) -> float:
+        """요청 1개와 tokens만큼의 용량을 확보할 때까지 대기하고 대기 시간을 반환합니다."""
+
+        # 버킷 용량보다 큰 요청이 영원히 대기하지 않도록 제한
+        tokens = min(tokens, self.tpm)
+        started = time.monotonic()
+
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                timeout = None
+                if ticket == self._serving_ticket:
+                    timeout = self._wait_seconds(tokens, now)
+                    if timeout <= 0:
+                        self._available_requests -= 1
+                        self._available_tokens -= tokens
+                        self._serving_ticket += 1
+                        self._cond.notify_all()
+                        break
+
+                self._cond.wait(timeout=timeout)
+
+            waited = time.monotonic() - started
+            self.requests += 1
+            if waited > 0.001:
+                self.throttled_requests += 1
+                self.throttled_seconds += waited
+            return waited
+
+    def reconcile(self, charged: int, actual: int) -> None:
+        """선차감한 추정치를 실제 사용량으로 보정합니다 (차이만큼 버킷에 돌려주거나 추가 차감)."""
+
+        with self._cond:
+            charged = min(charged, self.tpm)
+            self._available_tokens = min(
+                self.tpm, self._available_tokens + charged - actual
+            )
+            self.reconciled_tokens += charged - actual
+            self._cond.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """429 응답을 받으면 Retry-After 동안 해당 배포의 모든 호출을 멈춥니다."""
+
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self.rate_limited += 1
+            self._cond.notify_all()
+
+    def record_retry(self) -> None:
+        with self._cond:
+            self.retries += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "rpm": self.rpm,
+                "tpm": self.tpm,
+                "requests": self.requests,
+                "throttled_requests": self.throttled_requests,
+                "throttled_seconds": round(self.throttled_seconds, 3),
+                "retries": self.retries,
+                "rate_limited": self.rate_limited,
+                "reconciled_tokens": self.reconciled_tokens,
+                "queued": self._next_ticket - self._serving_ticket,
+            }
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+        try:
+            # HTTP 날짜 형식
+            parsed = email.utils.parsedate_to_datetime(retry_after)
+            return max(parsed.timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, openai.APIConnectionError):  # 타임아웃 포함
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return (
+            error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+        )
+    return False
+
+
+def _consumed_quota(error: Exception) -> bool:
+    """서버가 요청을 처리해 할당량을 사용했을 수 있는 오류인지 여부"""
+
+    if isinstance(error, openai.RateLimitError):
+        return False
+    if isinstance(error, openai.APIConnectionError):
+        # 타임아웃은 서버가 이미 처리 중이었을 수 있음
+        return isinstance(error, openai.APITimeoutError)
+    return True
+
+
+class RateLimiterRegistry:
+    """배포별 레이트 리미터와 재시도 정책을 관리하는 프로세스 단위 레지스트리"""
+
+    def __init__(
+        self,
+        limits: Dict[str, Tuple[int, int]],
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+        tokenizer: str,
+    ):
+        self.limits = limits  # {deployment: (rpm, tpm)}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.tokenizer = tokenizer
+        self._limiters: Dict[str, DeploymentRateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, deployment: str) -> DeploymentRateLimiter:
+        with self._lock:
+            limiter = self._limiters.get(deployment)
+            if limiter is None:
+                rpm, tpm = self.limits[deployment]
+                limiter = DeploymentRateLimiter(rpm, tpm)
+                self._limiters[deployment] = limiter
+            return limiter
+
+    def estimate_tokens(self, texts: Iterable[str], completion_tokens: int = 0) -> int:
+        encoding = _get_encoding(self.tokenizer)
+        return sum(len(encoding.encode(text)) for text in texts) + completion_tokens
+
+    def call(
+        self,
+        deployment: str,
+        tokens: int,
+        fn: Callable[[], T],
+        usage: Optional[Callable[[T], Optional[int]]] = None,
+    ) -> T:
+        """레이트 리미터를 통과한 뒤 fn을 호출하고, 일시적 오류는 지수 백오프로 재시도합니다.
+
+        TPM 추정치는 논리적 호출당 한 번만 차감하고 재시도는 요청 슬롯만 사용합니다.
+        usage가 결과에서 실제 토큰 수를 돌려주면 추정치를 그 값으로 보정합니다.
+        """
+
+        limiter = self.get(deployment)
+        attempt = 0
+        while True:
+            limiter.acquire(tokens if attempt == 0 else 0)
+            try:
+                result = fn()
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    # 서버에 도달하지 못한 호출이면 차감한 토큰을 돌려줌
+                    if not _consumed_quota(e):
+                        limiter.reconcile(tokens, 0)
+                    raise
+
+                delay = _retry_after_seconds(e)
+                if delay is None:
+                    # Retry-After가 없으면 지수 백오프 + full jitter
+                    delay = random.uniform(
+                        0, min(self.backoff_max, self.backoff_base * 2**attempt)
+                    )
+                if isinstance(e, openai.RateLimitError):
+                    limiter.pause(delay)
+
+                limiter.record_retry()
+                attempt += 1
+                time.sleep(delay)
+                continue
+
+            actual = usage(result) if usage is not None else None
+            if actual is not None:
+                limiter.reconcile(tokens, actual)
+            return result
+
+    def reconcile(self, deployment: str, estimated: int, actual: int) -> None:
+        """스트리밍처럼 호출이 끝난 뒤에야 사용량을 알 수 있는 경우 추정치를 보정합니다."""
+
+        self.get(deployment).reconcile(estimated, actual)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {name: limiter.stats() for name, limiter in limiters.items()}
+
+
+@lru_cache(maxsize=4)
+def _get_encoding(name: str):
+    return tiktoken.get_encoding(name)
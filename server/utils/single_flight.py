@@ -0,0 +1,81 @@
+import threading
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """같은 키에 대한 동시 작업을 하나로 합치는 single-flight 그룹
+
+    먼저 들어온 호출만 작업을 실행하고, 진행 중에 들어온 같은 키의 호출은
+    동일한 Future의 결과(또는 예외)를 공유합니다. 작업이 끝나면 키는 제거됩니다.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+        # 통계 카운터
+        self.executions = 0  # 실제로 실행된 작업 수
+        self.shared = 0  # 진행 중인 작업에 합류한 호출 수
+
+    def _join_or_create(self, key: Hashable):
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.shared += 1
+                return future, False
+            future = Future()
+            self._in_flight[key] = future
+            self.executions += 1
+            return future, True
+
+    def _release(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def do(self, key: Hashable, fn: Callable[..., T], *args: Any) -> T:
+        """호출 스레드에서 fn을 실행하거나, 진행 중인 같은 키의 결과를 기다립니다."""
+
+        future, leader = self._join_or_create(key)
+        if leader:
+            self._run(key, future, fn, *args)
+        return future.result()
+
+    def submit(
+        self, key: Hashable, executor: Executor, fn: Callable[..., T], *args: Any
+    ) -> Future:
+        """fn을 executor에서 실행하고 Future를 반환합니다. 같은 키는 Future를 공유합니다."""
+
+        future, leader = self._join_or_create(key)
+        if leader:
+            try:
+                executor.submit(self._run, key, future, fn, *args)
+            except BaseException as e:
+                # 실행기가 종료된 경우 등 - 합류한 호출이 영원히 기다리지 않도록 키 해제
+                future.set_exception(e)
+                self._release(key, future)
+                raise
+        return future
+
+    def _run(
+        self, key: Hashable, future: Future, fn: Callable[..., T], *args: Any
+    ) -> None:
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            self._release(key, future)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.executions + self.shared
+            return {
+                "in_flight": len(self._in_flight),
+                "executions": self.executions,
+                "shared": self.shared,
+                "hit_rate": round(self.shared / total, 4) if total else 0.0,
+            }
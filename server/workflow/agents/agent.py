@@ -1,11 +1,16 @@
+import itertools
 from langchain.schema import HumanMessage, SystemMessage, AIMessage
 from retrieval.vector_store import search_topic
-from utils.config import get_llm
+from utils.config import call_llm, get_llm, settings
+from workflow.history import split_recent_messages, summarize_rounds
+from workflow.cancellation import cancellations
 from workflow.state import DebateState, AgentType
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, TypedDict
+from typing import List, Dict, Any, Tuple, TypedDict
 from langchain_core.messages import BaseMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
+from langgraph.types import StreamWriter
 from langfuse.callback import CallbackHandler
 
 
@@ -21,13 +26,24 @@ class AgentState(TypedDict):
 # 에이전트 추상 클래스 정의
 class Agent(ABC):
 
+    # 이전 대화를 채팅 메시지로 재생할지 여부 (프롬프트에 대화 내용을 직접 넣는 경우 False)
+    replay_history = True
+    # 프롬프트에 직접 인용되는 최근 메시지 수 - 재생 시 제외하여 중복 전달 방지
+    quoted_messages = 0
+
     #
     def __init__(
-        self, system_prompt: str, role: str, k: int = 2, session_id: str = None
+        self,
+        system_prompt: str,
+        role: str,
+        k: int = 2,
+        session_id: str = None,
+        history_token_budget: int = settings.HISTORY_TOKEN_BUDGET,
     ):
         self.system_prompt = system_prompt
         self.role = role
         self.k = k  # 검색할 문서 개수
+        self.history_token_budget = history_token_budget  # 최근 대화 토큰 예산
         self._setup_graph()  # 그래프 설정
         self.session_id = session_id  # langfuse 세션 ID
 
@@ -53,10 +69,15 @@ class Agent(ABC):
         self.graph = workflow.compile()
 
     # 자료 검색
-    def _retrieve_context(self, state: AgentState) -> AgentState:
+    def _retrieve_context(
+        self, state: AgentState, config: RunnableConfig
+    ) -> AgentState:
+
+        # 요청별로 검색 문서 수를 바꿀 수 있도록 config 값을 우선 사용
+        k = config.get("configurable", {}).get("k", self.k)
 
         # k=0이면 검색 비활성화
-        if self.k <= 0:
+        if k <= 0:
             return {**state, "context": ""}
 
         debate_state = state["debate_state"]
@@ -72,7 +93,7 @@ class Agent(ABC):
             query += " 평가 기준 객관적 사실"
 
         # RAG 서비스를 통해 검색 실행
-        docs = search_topic(topic, self.role, query, k=self.k)  # noqa: F821
+        docs = search_topic(topic, self.role, query, k=k)  # noqa: F821
 
         debate_state["docs"][self.role] = (
             [doc.page_content for doc in docs] if docs else []
@@ -106,8 +127,20 @@ class Agent(ABC):
         # 시스템 프롬프트로 시작
         messages = [SystemMessage(content=self.system_prompt)]
 
-        # 기존 대화 기록 추가
-        for message in debate_state["messages"]:
+        # 대화를 재생하는 에이전트만 요약과 최근 대화를 메시지로 전달
+        # (재생하지 않는 에이전트는 프롬프트에 직접 포함)
+        summary, history = "", []
+        if self.replay_history:
+            summary, history = self._select_history(debate_state)
+
+        # 오래된 라운드는 누적 요약으로 전달
+        if summary:
+            messages.append(SystemMessage(content=f"지금까지의 토론 요약:\n{summary}"))
+
+        # 최근 대화 기록 추가 (토큰 예산 내)
+        if self.quoted_messages:
+            history = history[: -self.quoted_messages]
+        for message in history:
             if message["role"] == "assistant":
                 messages.append(AIMessage(content=message["content"]))
             else:
@@ -122,18 +155,77 @@ class Agent(ABC):
         # 상태 업데이트
         return {**state, "messages": messages}
 
+    # 요약되지 않은 최근 대화를 토큰 예산 안에서 선택하고 (요약, 최근 대화) 반환
+    # 예산을 넘는 발언은 버리지 않고 이번 프롬프트의 요약에 합침
+    def _select_history(self, debate_state: Dict[str, Any]) -> Tuple[str, List[Dict]]:
+        overflow, history = split_recent_messages(
+            debate_state["messages"],
+            debate_state.get("summarized_round", 0),
+            self.history_token_budget,
+        )
+        summary = debate_state.get("summary", "")
+        if overflow:
+            summary = summarize_rounds(debate_state["topic"], summary, overflow)
+        return summary, history
+
     # 프롬프트 생성 - 하위 클래스에서 구현 필요
     @abstractmethod
     def _create_prompt(self, state: Dict[str, Any]) -> str:
         pass
 
-    # LLM 호출
-    def _generate_response(self, state: AgentState) -> AgentState:
+    # LLM 호출 - 토큰이 생성되는 대로 스트림 이벤트로 전달
+    def _generate_response(
+        self, state: AgentState, config: RunnableConfig, writer: StreamWriter
+    ) -> AgentState:
 
         messages = state["messages"]
-        response = get_llm().invoke(messages)
-
-        return {**state, "response": response.content}
+        current_round = state["debate_state"]["current_round"]
+        session_id = config.get("configurable", {}).get("session_id", self.session_id)
+
+        # 첫 청크를 받을 때까지를 하나의 호출로 보고 레이트 리밋/재시도 적용
+        # (토큰 전송이 시작된 뒤에는 재시도하지 않음)
+        def open_stream():
+            stream = get_llm().stream(messages)
+            return stream, next(stream, None)
+
+        tokens = settings.estimate_llm_tokens(messages)
+        llm_stream, first_chunk = call_llm(messages, open_stream, tokens)
+        stream = llm_stream
+        if first_chunk is not None:
+            stream = itertools.chain([first_chunk], llm_stream)
+
+        chunks = []
+        usage_metadata = None
+        for chunk in stream:
+            # 토론이 취소되면 진행 중인 LLM 요청도 중단 (응답 스트림 종료)
+            if cancellations.is_cancelled(session_id):
+                llm_stream.close()
+                cancellations.check(session_id)
+            # 사용량은 내용이 없는 마지막 청크에 포함됨
+            if chunk.usage_metadata:
+                usage_metadata = chunk.usage_metadata
+            if not chunk.content:
+                continue
+            chunks.append(chunk.content)
+            writer(
+                {
+                    "type": "token",
+                    "data": {
+                        "role": self.role,
+                        "round": current_round,
+                        "delta": chunk.content,
+                    },
+                }
+            )
+
+        # 레이트 리미터의 토큰 추정치를 실제 사용량으로 보정
+        if usage_metadata:
+            settings.record_llm_usage(tokens, usage_metadata)
+
+        # 스트리밍 청크 수를 생성 토큰 수로 기록 (취소 시 절약 토큰 추정에 사용)
+        cancellations.record_turn(session_id, len(chunks))
+
+        return {**state, "response": "".join(chunks)}
 
     # 상태 업데이트
     def _update_state(self, state: AgentState) -> AgentState:
@@ -156,15 +248,21 @@ class Agent(ABC):
         return {**state, "debate_state": new_debate_state}
 
     # 토론 실행
-    def run(self, state: DebateState) -> DebateState:
+    def run(self, state: DebateState, config: RunnableConfig) -> DebateState:
 
         # 초기 에이전트 상태 구성
         agent_state = AgentState(
             debate_state=state, context="", messages=[], response=""
         )
 
+        # 그래프는 요청 간에 공유되므로 세션 ID는 요청 config에서 가져옴
+        session_id = config.get("configurable", {}).get("session_id", self.session_id)
+
+        # 취소된 토론이면 검색/LLM 호출 전에 중단
+        cancellations.check(session_id)
+
         # 내부 그래프 실행
-        langfuse_handler = CallbackHandler(session_id=self.session_id)
+        langfuse_handler = CallbackHandler(session_id=session_id)
         result = self.graph.invoke(
             agent_state, config={"callbacks": [langfuse_handler]}
         )
@@ -5,6 +5,9 @@ from typing import Dict, Any
 
 class ConAgent(Agent):
 
+    # 찬성 측 마지막 주장은 프롬프트에 직접 인용됨
+    quoted_messages = 1
+
     def __init__(self, k: int = 2, session_id: str = None):
         super().__init__(
             system_prompt="당신은 논리적이고 설득력 있는 반대 측 토론자입니다. 찬성 측 주장에 대해 적극적으로 반박하세요.",
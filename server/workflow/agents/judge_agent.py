@@ -1,3 +1,4 @@
+from utils.config import settings
 from workflow.agents.agent import Agent
 from workflow.state import AgentType
 from typing import Dict, Any
@@ -5,12 +6,16 @@ from typing import Dict, Any
 
 class JudgeAgent(Agent):
 
+    # 토론 내용은 프롬프트에 요약 형태로 직접 포함
+    replay_history = False
+
     def __init__(self, k: int = 2, session_id: str = None):
         super().__init__(
             system_prompt="당신은 공정하고 논리적인 토론 심판입니다. 양측의 주장을 면밀히 검토하고 객관적으로 평가해주세요.",
             role=AgentType.JUDGE,
             k=k,
             session_id=session_id,
+            history_token_budget=settings.JUDGE_HISTORY_TOKEN_BUDGET,
         )
 
     def _create_prompt(self, state: Dict[str, Any]) -> str:
@@ -38,9 +43,14 @@ class JudgeAgent(Agent):
     def _build_debate_summary(self, state: Dict[str, Any]) -> str:
 
         summary = ""
+        previous_summary, history = self._select_history(state)
+
+        # 이전 라운드의 누적 요약
+        if previous_summary:
+            summary += f"\n\n[이전 라운드 요약]\n{previous_summary}"
 
-        # 모든 메시지 순회
-        for message in state["messages"]:
+        # 요약되지 않은 최근 메시지 순회 (토큰 예산 내)
+        for message in history:
             role = message["role"]
             content = message["content"]
 
@@ -0,0 +1,26 @@
+from langchain_core.runnables import RunnableConfig
+
+from retrieval.vector_store import prefetch_topic_vector_store
+from workflow.state import DebateState
+
+
+class RetrievalPrefetcher:
+    """토론 시작 시 검색 파이프라인을 미리 시작하는 노드
+
+    검색은 대화 내용과 무관하게 주제에만 의존하므로 미리 시작해두고,
+    각 에이전트는 자기 차례에 준비된 결과를 기다립니다.
+    모든 역할(찬성/반대/심판)의 검색어는 하나의 주제 인덱스 빌드에서 함께 처리됩니다.
+    """
+
+    def __init__(self, k: int = 2):
+        self.k = k  # 검색할 문서 개수 (0이면 검색 비활성화)
+
+    def run(self, state: DebateState, config: RunnableConfig) -> DebateState:
+        k = config.get("configurable", {}).get("k", self.k)
+        if k <= 0:
+            return state
+
+        # 결과를 기다리지 않고 빌드만 시작
+        prefetch_topic_vector_store(state["topic"])
+
+        return state
@@ -1,11 +1,58 @@
+from typing import Dict, List
+
+from utils.config import settings
+from workflow.history import count_tokens, summarize_rounds
 from workflow.state import DebateState
 
 
 class RoundManager:
+    def __init__(
+        self,
+        window_rounds: int = settings.HISTORY_WINDOW_ROUNDS,
+        token_budget: int = settings.HISTORY_TOKEN_BUDGET,
+    ):
+        self.window_rounds = window_rounds  # 요약하지 않고 유지할 최근 라운드 수
+        self.token_budget = token_budget  # 요약하지 않은 대화가 넘지 않아야 할 토큰 수
+
     def run(self, state: DebateState) -> DebateState:
-        return self.increment_round(state)
+        new_state = self.update_summary(state)
+        return self.increment_round(new_state)
 
     def increment_round(self, state: DebateState) -> DebateState:
         new_state = state.copy()
         new_state["current_round"] = state["current_round"] + 1
         return new_state
+
+    # 라운드가 끝날 때마다 창 밖으로 밀려난 라운드를 누적 요약에 반영
+    # 창 안의 대화가 토큰 예산을 넘으면 방금 끝난 라운드를 제외한 오래된 라운드부터 추가로 반영
+    def update_summary(self, state: DebateState) -> DebateState:
+        summarized_round = state.get("summarized_round", 0)
+        fold_until = max(summarized_round, state["current_round"] - self.window_rounds)
+        while fold_until < state["current_round"] - 1 and (
+            self._pending_tokens(state["messages"], fold_until) > self.token_budget
+        ):
+            fold_until += 1
+        if fold_until <= summarized_round:
+            return state
+
+        messages = [
+            m
+            for m in state["messages"]
+            if summarized_round < m.get("current_round", 0) <= fold_until
+        ]
+
+        new_state = state.copy()
+        if messages:
+            new_state["summary"] = summarize_rounds(
+                state["topic"], state.get("summary", ""), messages
+            )
+        new_state["summarized_round"] = fold_until
+        return new_state
+
+    # 요약되지 않고 남는 대화의 토큰 수
+    def _pending_tokens(self, messages: List[Dict], summarized_round: int) -> int:
+        return sum(
+            count_tokens(m["content"])
+            for m in messages
+            if m.get("current_round", 0) > summarized_round
+        )
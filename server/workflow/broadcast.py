@@ -0,0 +1,96 @@
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, List, Optional
+
+
+class _Broadcast:
+    def __init__(self):
+        self.history: List[str] = []  # 늦게 합류한 구독자에게 재전송할 이벤트
+        self.subscribers: List[asyncio.Queue] = []
+        self.done = False
+        self.task: Optional[asyncio.Task] = None
+
+
+class DebateBroadcaster:
+    """같은 요청의 토론 스트림 하나를 여러 구독자에게 나눠 보내는 허브
+
+    첫 요청만 실제 토론을 실행하고, 진행 중에 들어온 같은 키의 요청은 지금까지의
+    이벤트를 재전송받은 뒤 이후 이벤트를 함께 받습니다. 이벤트 루프 안에서만 사용합니다.
+    모든 구독자가 떠나면 원본 스트림을 닫아 토론을 취소합니다.
+    """
+
+    def __init__(self, replayable: Optional[Callable[[str], bool]] = None):
+        self._broadcasts: Dict[Hashable, _Broadcast] = {}
+        # 늦게 합류한 구독자에게 재전송할 이벤트인지 판단 (None이면 모두 재전송)
+        self._replayable = replayable
+
+        # 통계 카운터
+        self.started = 0  # 실제로 실행된 토론 수
+        self.attached = 0  # 진행 중인 토론에 합류한 요청 수
+
+    def attach(self, key: Hashable) -> Optional[AsyncIterator[str]]:
+        """같은 키로 진행 중인 토론이 있으면 구독자로 합류합니다. 없으면 None을 반환합니다."""
+
+        broadcast = self._broadcasts.get(key)
+        if broadcast is None:
+            return None
+        self.attached += 1
+        return self._subscribe(broadcast)
+
+    def start(self, key: Hashable, stream: AsyncIterator[str]) -> AsyncIterator[str]:
+        """stream을 새 토론으로 등록하고 첫 구독자의 이벤트 스트림을 반환합니다."""
+
+        broadcast = _Broadcast()
+        self._broadcasts[key] = broadcast
+        broadcast.task = asyncio.create_task(self._publish(key, broadcast, stream))
+        self.started += 1
+        return self._subscribe(broadcast)
+
+    def _subscribe(self, broadcast: _Broadcast) -> AsyncIterator[str]:
+        # 재전송 목록 복사와 구독 등록 사이에 await가 없으므로 이벤트 누락/중복 없음
+        queue: asyncio.Queue = asyncio.Queue()
+        for event in broadcast.history:
+            queue.put_nowait(event)
+        broadcast.subscribers.append(queue)
+        return self._listen(broadcast, queue)
+
+    async def _publish(
+        self, key: Hashable, broadcast: _Broadcast, stream: AsyncIterator[str]
+    ) -> None:
+        try:
+            async for event in stream:
+                if self._replayable is None or self._replayable(event):
+                    broadcast.history.append(event)
+                for queue in broadcast.subscribers:
+                    queue.put_nowait(event)
+        finally:
+            broadcast.done = True
+            if self._broadcasts.get(key) is broadcast:
+                del self._broadcasts[key]
+            for queue in broadcast.subscribers:
+                queue.put_nowait(None)
+            await stream.aclose()
+
+    async def _listen(
+        self, broadcast: _Broadcast, queue: asyncio.Queue
+    ) -> AsyncIterator[str]:
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            broadcast.subscribers.remove(queue)
+            # 마지막 구독자가 떠나면 토론 취소
+            if not broadcast.subscribers and not broadcast.done:
+                broadcast.task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.started + self.attached
+        return {
+            "running": len(self._broadcasts),
+            "subscribers": sum(len(b.subscribers) for b in self._broadcasts.values()),
+            "started": self.started,
+            "attached": self.attached,
+            "hit_rate": round(self.attached / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,119 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class DebateCancelledError(Exception):
+    """클라이언트 연결 종료 등으로 토론이 취소되었을 때 발생"""
+
+
+class _DebateRun:
+    def __init__(self, total_turns: int):
+        self.event = threading.Event()
+        self.total_turns = total_turns
+        self.completed_turns = 0
+        self.tokens = 0
+
+
+class CancellationRegistry:
+    """session_id 단위로 진행 중인 토론의 취소 신호와 토큰 사용량을 관리
+
+    그래프 노드와 LLM 스트리밍 루프는 is_cancelled/check로 협조적으로 취소를 확인합니다.
+    """
+
+    def __init__(self):
+        self._runs: Dict[str, _DebateRun] = {}
+        # 해제 후에도 그래프 스레드가 취소를 확인할 수 있도록 최근 취소된 세션 보관
+        self._recently_cancelled: "OrderedDict[str, bool]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 통계 카운터
+        self.cancelled_debates = 0
+        self.tokens_saved = 0  # 취소로 생성하지 않은 토큰 수 추정치
+        self._total_turns = 0
+        self._total_tokens = 0
+
+    def try_register(
+        self, session_id: str, total_turns: int
+    ) -> Optional[threading.Event]:
+        """같은 세션이 실행 중이 아니면 등록하고 취소 이벤트를 반환합니다. 실행 중이면 None."""
+
+        with self._lock:
+            if session_id in self._runs:
+                return None
+            run = _DebateRun(total_turns)
+            self._runs[session_id] = run
+            # 취소된 토론을 재개하는 경우
+            self._recently_cancelled.pop(session_id, None)
+            return run.event
+
+    def register(self, session_id: str, total_turns: int) -> threading.Event:
+        event = self.try_register(session_id, total_turns)
+        if event is None:
+            raise ValueError(f"Debate {session_id} is already running")
+        return event
+
+    def release(
+        self, session_id: str, event: Optional[threading.Event] = None
+    ) -> None:
+        """등록을 해제합니다. event를 주면 해당 실행의 등록일 때만 해제합니다."""
+
+        with self._lock:
+            run = self._runs.get(session_id)
+            if run is None or (event is not None and run.event is not event):
+                return
+            del self._runs[session_id]
+            if run.event.is_set():
+                self._recently_cancelled[session_id] = True
+                while len(self._recently_cancelled) > 1024:
+                    self._recently_cancelled.popitem(last=False)
+
+    def record_turn(self, session_id: Optional[str], tokens: int) -> None:
+        with self._lock:
+            self._total_turns += 1
+            self._total_tokens += tokens
+            run = self._runs.get(session_id)
+            if run is not None:
+                run.completed_turns += 1
+                run.tokens += tokens
+
+    def cancel(self, session_id: str) -> None:
+        with self._lock:
+            run = self._runs.get(session_id)
+            if run is None or run.event.is_set():
+                return
+            run.event.set()
+
+            # 남은 발언 수 x 평균 발언 토큰 수로 절약한 토큰을 추정
+            remaining_turns = max(run.total_turns - run.completed_turns, 0)
+            if run.completed_turns:
+                avg_tokens = run.tokens / run.completed_turns
+            elif self._total_turns:
+                avg_tokens = self._total_tokens / self._total_turns
+            else:
+                avg_tokens = 0
+            self.cancelled_debates += 1
+            self.tokens_saved += int(remaining_turns * avg_tokens)
+
+    def is_cancelled(self, session_id: Optional[str]) -> bool:
+        with self._lock:
+            if session_id in self._recently_cancelled:
+                return True
+            run = self._runs.get(session_id)
+            return run is not None and run.event.is_set()
+
+    def check(self, session_id: Optional[str]) -> None:
+        if self.is_cancelled(session_id):
+            raise DebateCancelledError(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": len(self._runs),
+                "cancelled_debates": self.cancelled_debates,
+                "tokens_saved": self.tokens_saved,
+            }
+
+
+# 프로세스 단위로 공유되는 취소 레지스트리
+cancellations = CancellationRegistry()
@@ -0,0 +1,20 @@
+import sqlite3
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from utils.config import settings
+
+# 토론 그래프 체크포인트 저장소 - 기존 SQLite DB에 노드 실행마다 상태를 기록
+# (thread_id = 토론 session_id)
+checkpoint_conn = sqlite3.connect(settings.DB_PATH, check_same_thread=False)
+checkpointer = SqliteSaver(checkpoint_conn)
+checkpointer.setup()
+
+
+def delete_checkpoints(session_id: str) -> None:
+    """이력에 저장된 토론의 체크포인트를 삭제합니다."""
+    with checkpointer.lock, checkpoint_conn:
+        checkpoint_conn.execute(
+            "DELETE FROM checkpoints WHERE thread_id = ?", (session_id,)
+        )
+        checkpoint_conn.execute("DELETE FROM writes WHERE thread_id = ?", (session_id,))
@@ -1,12 +1,18 @@
+from functools import lru_cache
+
 from workflow.agents.con_agent import ConAgent
 from workflow.agents.judge_agent import JudgeAgent
 from workflow.agents.pro_agent import ProAgent
+from workflow.agents.retrieval_prefetcher import RetrievalPrefetcher
 from workflow.agents.round_manager import RoundManager
+from workflow.checkpoint import checkpointer
 from workflow.state import DebateState, AgentType
 from langgraph.graph import StateGraph, END
 
 
-def create_debate_graph(enable_rag: bool = True, session_id: str = ""):
+def create_debate_graph(
+    enable_rag: bool = True, session_id: str = "", checkpointer=None
+):
 
     # 그래프 생성
     workflow = StateGraph(DebateState)
@@ -17,8 +23,10 @@ def create_debate_graph(enable_rag: bool = True, session_id: str = ""):
     con_agent = ConAgent(k=k_value, session_id=session_id)
     judge_agent = JudgeAgent(k=k_value, session_id=session_id)
     round_manager = RoundManager()
+    retrieval_prefetcher = RetrievalPrefetcher(k=k_value)
 
     # 노드 추가
+    workflow.add_node("PREFETCH", retrieval_prefetcher.run)
     workflow.add_node(AgentType.PRO, pro_agent.run)
     workflow.add_node(AgentType.CON, con_agent.run)
     workflow.add_node(AgentType.JUDGE, judge_agent.run)
@@ -34,11 +42,20 @@ def create_debate_graph(enable_rag: bool = True, session_id: str = ""):
         [AgentType.JUDGE, AgentType.PRO],
     )
 
-    workflow.set_entry_point(AgentType.PRO)
+    # 검색 선행 실행 → 찬성
+    workflow.set_entry_point("PREFETCH")
+    workflow.add_edge("PREFETCH", AgentType.PRO)
     workflow.add_edge(AgentType.JUDGE, END)
 
-    # 그래프 컴파일
-    return workflow.compile()
+    # 그래프 컴파일 - checkpointer가 있으면 노드 실행마다 상태 저장
+    return workflow.compile(checkpointer=checkpointer)
+
+
+# RAG 사용 여부별로 한 번만 컴파일된 그래프 템플릿
+# 요청별 값(session_id 등)은 RunnableConfig의 configurable로 전달
+@lru_cache(maxsize=2)
+def get_debate_graph(enable_rag: bool = True):
+    return create_debate_graph(enable_rag, checkpointer=checkpointer)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,73 @@
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import tiktoken
+from langchain.schema import HumanMessage, SystemMessage
+
+from utils.config import call_llm, get_llm, settings
+from workflow.state import AgentType
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    return tiktoken.get_encoding(settings.HISTORY_TOKENIZER)
+
+
+def count_tokens(text: str) -> int:
+    return len(_get_encoding().encode(text))
+
+
+def split_recent_messages(
+    messages: List[Dict], summarized_round: int, token_budget: int
+) -> Tuple[List[Dict], List[Dict]]:
+    """요약되지 않은 메시지를 (요약할 메시지, 그대로 전달할 최근 메시지)로 나눕니다.
+
+    최근 메시지는 최신순으로 토큰 예산 안에서 선택하며, 예산을 넘는 오래된 메시지는
+    버리지 않고 요약 대상으로 돌려줍니다. 두 목록 모두 원래 대화 순서를 유지합니다.
+    """
+
+    pending = [
+        message
+        for message in messages
+        if message.get("current_round", 0) > summarized_round
+    ]
+
+    used_tokens = 0
+    start = len(pending)
+    while start > 0:
+        tokens = count_tokens(pending[start - 1]["content"])
+        if start < len(pending) and used_tokens + tokens > token_budget:
+            break
+        used_tokens += tokens
+        start -= 1
+
+    return pending[:start], pending[start:]
+
+
+def summarize_rounds(topic: str, summary: str, messages: List[Dict]) -> str:
+    """기존 요약에 새 라운드의 발언을 합쳐 갱신된 요약을 반환합니다."""
+
+    transcript = "\n\n".join(
+        f"[{message.get('current_round')}라운드] "
+        f"{AgentType.to_korean(message['role'])}: {message['content']}"
+        for message in messages
+    )
+
+    prompt = f"""
+        다음은 '{topic}'에 대한 찬반 토론의 요약과 새로 진행된 발언입니다.
+        기존 요약에 새 발언의 핵심 주장과 근거를 반영하여 요약을 갱신해주세요.
+        찬성 측과 반대 측의 주장을 구분하고, {settings.HISTORY_SUMMARY_MAX_CHARS}자 이내로 작성해주세요.
+
+        기존 요약:
+        {summary or "(없음)"}
+
+        새 발언:
+        {transcript}
+        """
+
+    messages = [
+        SystemMessage(content="당신은 토론 내용을 간결하고 공정하게 요약하는 서기입니다."),
+        HumanMessage(content=prompt),
+    ]
+
+    return call_llm(messages, lambda: get_llm().invoke(messages)).content
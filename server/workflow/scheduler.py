@@ -0,0 +1,125 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차 토론을 받을 수 없을 때 발생"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Debate queue is full. Retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class DebateOutcome:
+    COMPLETED = "completed"  # 끝까지 실행됨
+    CANCELLED = "cancelled"  # 연결 종료/구독자 이탈 등으로 중단됨
+    FAILED = "failed"  # 그래프 실행 오류로 중단됨
+
+
+class DebateTicket:
+    def __init__(self):
+        self.granted = False
+        self.released = False
+        self.started_at: Optional[float] = None
+        self.changed = asyncio.Event()  # 대기 순번이 바뀌거나 실행이 허가되면 설정
+
+
+class DebateScheduler:
+    """동시에 실행되는 토론 수를 제한하고 나머지는 FIFO 대기열에 보관하는 스케줄러
+
+    이벤트 루프 안에서만 사용하므로 별도의 락 없이 상태를 변경합니다.
+    """
+
+    def __init__(self, max_concurrent: int, max_queued: int):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self._waiting: Deque[DebateTicket] = deque()
+
+        # 상태별 게이지/카운터
+        self.running = 0
+        self.finished = 0  # 끝까지 실행된 토론 수
+        self.cancelled = 0
+        self.failed = 0
+        self.rejected = 0
+        self._avg_seconds = 60.0  # 끝까지 실행된 토론 1회 평균 소요 시간 (이동 평균)
+
+    def enqueue(self) -> DebateTicket:
+        """바로 실행 가능하면 슬롯을 배정하고, 아니면 대기열에 넣습니다."""
+
+        ticket = DebateTicket()
+        if self.running < self.max_concurrent and not self._waiting:
+            self._grant(ticket)
+        elif len(self._waiting) >= self.max_queued:
+            self.rejected += 1
+            raise QueueFullError(self.retry_after())
+        else:
+            self._waiting.append(ticket)
+        return ticket
+
+    def _grant(self, ticket: DebateTicket) -> None:
+        ticket.granted = True
+        ticket.started_at = time.monotonic()
+        self.running += 1
+        ticket.changed.set()
+
+    def position(self, ticket: DebateTicket) -> int:
+        try:
+            return self._waiting.index(ticket) + 1
+        except ValueError:
+            return 0
+
+    async def wait(self, ticket: DebateTicket) -> AsyncIterator[int]:
+        """실행이 허가될 때까지 대기 순번이 바뀔 때마다 순번을 전달합니다."""
+
+        while not ticket.granted:
+            ticket.changed.clear()
+            yield self.position(ticket)
+            await ticket.changed.wait()
+
+    def release(
+        self, ticket: DebateTicket, outcome: str = DebateOutcome.CANCELLED
+    ) -> None:
+        """슬롯을 반환합니다. 평균 소요 시간에는 끝까지 실행된 토론만 반영합니다."""
+
+        if ticket.released:
+            return
+        ticket.released = True
+
+        if ticket.granted:
+            self.running -= 1
+            if outcome == DebateOutcome.COMPLETED:
+                self.finished += 1
+                elapsed = time.monotonic() - ticket.started_at
+                self._avg_seconds = self._avg_seconds * 0.8 + elapsed * 0.2
+            elif outcome == DebateOutcome.FAILED:
+                self.failed += 1
+            else:
+                self.cancelled += 1
+        elif ticket in self._waiting:
+            # 대기 중에 연결이 끊긴 경우
+            self._waiting.remove(ticket)
+
+        # 빈 슬롯을 대기열 앞쪽부터 배정하고 나머지에게 순번 변경 알림
+        while self._waiting and self.running < self.max_concurrent:
+            self._grant(self._waiting.popleft())
+        for waiting in self._waiting:
+            waiting.changed.set()
+
+    def retry_after(self) -> int:
+        # 대기열이 한 번 비워지는 데 걸리는 예상 시간
+        rounds = (len(self._waiting) + 1) / max(self.max_concurrent, 1)
+        return max(1, int(self._avg_seconds * rounds))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._waiting),
+            "running": self.running,
+            "finished": self.finished,
+            "cancelled": self.cancelled,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+        }
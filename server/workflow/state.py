@@ -25,5 +25,8 @@ class DebateState(TypedDict):
     current_round: int
     prev_node: str
     max_rounds: int
+    enable_rag: bool  # 재개 시 같은 그래프 템플릿을 선택하기 위해 저장
     docs: Dict[str, List]  # RAG 검색 결과
     contexts: Dict[str, str]  # RAG 검색 컨텍스트
+    summary: str  # 오래된 라운드의 누적 요약
+    summarized_round: int  # 요약에 반영된 마지막 라운드
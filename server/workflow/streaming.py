@@ -0,0 +1,72 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Optional
+
+from utils.config import settings
+from workflow.cancellation import DebateCancelledError
+
+# 동기 그래프를 실행하는 스레드 풀 - 이벤트 루프를 막지 않도록 토론을 여기서 실행
+graph_executor = ThreadPoolExecutor(
+    max_workers=settings.DEBATE_WORKER_THREADS,
+    thread_name_prefix="debate-graph",
+)
+
+# 스트림 종료 표시
+_DONE = object()
+
+
+async def astream_graph(
+    graph: Any,
+    input: Any,
+    config: Dict[str, Any],
+    cancel_event: Optional[threading.Event] = None,
+    **stream_kwargs: Any,
+) -> AsyncIterator[Any]:
+    """동기 graph.stream()을 스레드 풀에서 실행하고 청크를 asyncio 큐로 전달합니다.
+
+    cancel_event가 설정되면 다음 노드 경계에서 그래프 실행을 중단합니다.
+    소비자가 끝까지 읽지 않고 빠져나가면 cancel_event를 설정합니다.
+    """
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def produce():
+        try:
+            stream = graph.stream(input, config=config, **stream_kwargs)
+            try:
+                for chunk in stream:
+                    # 노드 경계마다 취소 여부 확인
+                    if cancel_event is not None and cancel_event.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            finally:
+                stream.close()
+        except DebateCancelledError:
+            # 노드 내부에서 취소를 감지한 경우 - 정상 종료로 처리
+            pass
+        except BaseException as e:
+            # 예외는 소비자 쪽(이벤트 루프)에서 다시 발생시킴
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+
+    future = loop.run_in_executor(graph_executor, produce)
+
+    completed = False
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+        completed = True
+    finally:
+        # 소비자가 중간에 빠져나가면 그래프도 중단
+        if not completed and cancel_event is not None:
+            cancel_event.set()
+
+    await future